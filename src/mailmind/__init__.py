@@ -1,7 +1,8 @@
 """Email filtering and categorization package."""
 
+from typing import Any
+
 from .inference.models import Account, Category, ProcessingOptions
-from .inference.categorizer import initialize_categorizer, batch_categorize_emails_for_account
 
 __version__ = "0.1.0"
 
@@ -11,4 +12,16 @@ __all__ = [
     "ProcessingOptions",
     "initialize_categorizer",
     "batch_categorize_emails_for_account"
-] 
\ No newline at end of file
+]
+
+# Categorizer exports pull in torch/transformers, so resolve them on first access (PEP 562)
+_LAZY_CATEGORIZER_EXPORTS = ("initialize_categorizer", "batch_categorize_emails_for_account")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_CATEGORIZER_EXPORTS:
+        from .inference import categorizer
+        value = getattr(categorizer, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,17 +2,72 @@
 
 import os
 import logging
-from typing import Dict, List, Optional
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import yaml
 
+# libyaml's C loader is several times faster; fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 from .inference.models import Account, ProcessingOptions, Category
-from .inference import categorizer
 
 logger = logging.getLogger(__name__)
 
+
+# Config keys and defaults for each model, applied in a single pass per object
+_CATEGORY_FIELDS = (
+    ("name", ""),
+    ("description", ""),
+    ("foldername", ""),
+)
+# (Account field, config key, default)
+_ACCOUNT_FIELDS = (
+    ("name", "name", ""),
+    ("email_address", "email", ""),
+    ("password", "password", ""),
+    ("imap_server", "imap_server", ""),
+    ("imap_port", "imap_port", 993),
+    ("ssl", "ssl", True),
+    ("folders", "folders", None),
+)
+_OPTION_FIELDS = (
+    ("max_emails_per_run", 100),
+    ("batch_size", 10),
+    ("idle_timeout", 1740),
+    ("move_emails", True),
+    ("confidence_threshold", 60.0),
+)
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file, reusing the result while the file is unchanged.
+    
+    The modification time and size are only part of the cache key, so an
+    edited file misses the cache and is parsed again.
+    
+    Args:
+        path: Absolute path to the YAML file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+        
+    Returns:
+        Parsed YAML document (shared; callers must copy before mutating)
+    """
+    # Hand libyaml the raw bytes; it detects the encoding and decodes in C
+    with open(path, "rb") as f:
+        return yaml.load(f.read(), Loader=_SafeLoader)
+
+
 class ConfigManager:
     """Manages configuration loading and validation."""
     
+    __slots__ = ("config_path", "accounts", "options", "_file_signature")
+    
     def __init__(self, config_path: str):
         """Initialize the configuration manager.
         
@@ -23,54 +78,77 @@ class ConfigManager:
         self.accounts: List[Account] = []
         self.options: ProcessingOptions = ProcessingOptions()
         
+        # (mtime_ns, size) of the config file as last loaded, None until a load got that far
+        self._file_signature: Optional[Tuple[int, int]] = None
+        
         # Load configuration
         self._load_config()
     
     def _load_config(self) -> None:
         """Load and validate configuration from YAML file."""
         try:
-            with open(self.config_path, "r") as f:
-                config = yaml.safe_load(f)
+            stat = os.stat(self.config_path)
+            config = deepcopy(
+                _parse_yaml_cached(os.path.abspath(self.config_path), stat.st_mtime_ns, stat.st_size)
+            )
             
             # Load accounts
+            accounts = []
             for account_config in config.get("accounts", []):
-                # Load categories for this account
-                categories = []
-                for category_config in account_config.get("categories", []):
-                    category = Category(
-                        name=category_config.get("name", ""),
-                        description=category_config.get("description", ""),
-                        foldername=category_config.get("foldername", "")
-                    )
-                    categories.append(category)
-                
-                account = Account(
-                    name=account_config.get("name", ""),
-                    email_address=account_config.get("email", ""),
-                    password=account_config.get("password", ""),
-                    imap_server=account_config.get("imap_server", ""),
-                    imap_port=account_config.get("imap_port", 993),
-                    ssl=account_config.get("ssl", True),
-                    folders=account_config.get("folders", None),
-                    categories=categories
-                )
-                self.accounts.append(account)
+                categories = [
+                    Category(**{key: category_config.get(key, default) for key, default in _CATEGORY_FIELDS})
+                    for category_config in account_config.get("categories", [])
+                ]
+                accounts.append(Account(
+                    categories=categories,
+                    **{field: account_config.get(key, default) for field, key, default in _ACCOUNT_FIELDS}
+                ))
             
             # Load processing options
             options_config = config.get("options", {})
-            self.options = ProcessingOptions(
-                max_emails_per_run=options_config.get("max_emails_per_run", 100),
-                batch_size=options_config.get("batch_size", 10),
-                idle_timeout=options_config.get("idle_timeout", 1740),
-                move_emails=options_config.get("move_emails", True)
+            options = ProcessingOptions(
+                **{key: options_config.get(key, default) for key, default in _OPTION_FIELDS}
             )
             
+            # Swap in the new configuration only once it has been fully built
+            self.accounts = accounts
+            self.options = options
+            self._file_signature = (stat.st_mtime_ns, stat.st_size)
+            
             logger.info(f"Loaded configuration from {self.config_path}")
             logger.debug(f"Found {len(self.accounts)} accounts")
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             raise
     
+    def reload_if_changed(self) -> bool:
+        """Reload the configuration if the file changed since it was last loaded.
+        
+        Costs a single os.stat when the file is unchanged. If the new file
+        fails to load, the previous configuration stays in effect and the file
+        is not retried until it changes again.
+        
+        Returns:
+            True if a changed configuration was loaded, False otherwise
+        """
+        try:
+            stat = os.stat(self.config_path)
+        except OSError as e:
+            logger.warning(f"Could not check configuration file {self.config_path}: {e}")
+            return False
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._file_signature is not None and signature == self._file_signature:
+            return False
+        
+        try:
+            self._load_config()
+        except Exception:
+            self._file_signature = signature
+            logger.warning("Keeping previous configuration")
+            return False
+        return True
+    
     def validate(self) -> None:
         """Validate the loaded configuration."""
         if not self.accounts:
@@ -81,10 +159,14 @@ class ConfigManager:
                 raise ValueError(f"Invalid account configuration for {account}")
             
             # Validate categories
-            category_names = set()
-            for category in account.categories:
-                if not category.name:
-                    raise ValueError(f"Category name cannot be empty for account {account.name}")
-                if category.name.upper() in category_names:
-                    raise ValueError(f"Duplicate category name '{category.name}' for account {account.name}")
-                category_names.add(category.name.upper()) 
\ No newline at end of file
+            if any(not category.name for category in account.categories):
+                raise ValueError(f"Category name cannot be empty for account {account.name}")
+            
+            names_upper = [category.name_upper for category in account.categories]
+            if len(set(names_upper)) != len(names_upper):
+                # Only walk the list again to name the offender
+                seen = set()
+                for category, name_upper in zip(account.categories, names_upper):
+                    if name_upper in seen:
+                        raise ValueError(f"Duplicate category name '{category.name}' for account {account.name}")
+                    seen.add(name_upper) 
\ No newline at end of file
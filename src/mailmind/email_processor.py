@@ -2,16 +2,22 @@
 
 import logging
 import os
+import queue
 import signal
 import sys
 import threading
-import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
 from imapclient import IMAPClient
 
-from mailmind.inference.categorizer import batch_categorize_emails_for_account, initialize_categorizer
+from mailmind.inference.categorizer import (
+    batch_categorize_emails_for_account,
+    initialize_categorizer,
+    set_escalation_threshold,
+)
 from mailmind.inference.models import Email, Account, ProcessingOptions
 from .config_manager import ConfigManager
 from .sqlite_state_manager import SQLiteStateManager
@@ -19,8 +25,17 @@ from .imap_manager import IMAPManager
 
 logger = logging.getLogger(__name__)
 
-# Global flag for controlling the continuous monitoring
-running = True
+# Maximum number of processed Message-IDs remembered in memory
+PROCESSED_CACHE_SIZE = 50000
+
+# Maximum number of Message-IDs written to the state database per transaction
+STATE_WRITE_BATCH_SIZE = 500
+
+# Seconds between checks of the config file while monitoring
+CONFIG_RELOAD_INTERVAL = 30
+
+# Maximum number of accounts processed at the same time in a one-time run
+MAX_ACCOUNT_WORKERS = 4
 
 class EmailProcessor:
     """Processes emails from IMAP accounts."""
@@ -37,17 +52,220 @@ class EmailProcessor:
         # Set up state manager - use SQLite with default path
         self.state_manager = SQLiteStateManager()
         
+        # Set to stop continuous monitoring
+        self._stop_event = threading.Event()
+        
+        # Message-IDs known to be processed, so repeated folder scans skip the database
+        self._processed_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._processed_lock = threading.Lock()
+        
+        # State writes are handed to a single writer thread, so IMAP passes never wait on a commit
+        self._write_queue: "queue.Queue[List[str]]" = queue.Queue(maxsize=10000)
+        self._writer_thread = threading.Thread(
+            target=self._state_writer_loop, name="state-writer", daemon=True
+        )
+        self._writer_thread.start()
+        
         # Set up IMAP manager
         self.imap_manager = IMAPManager()
         
         # Initialize categorizer
         try:
-            initialize_categorizer()
+            initialize_categorizer(
+                escalation_threshold=self.config_manager.options.confidence_threshold
+            )
             logger.debug("Categorizer initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing categorizer: {e}")
             raise
     
+    def _reload_config(self) -> bool:
+        """Reload the config file if it changed and apply its processing options.
+        
+        Returns:
+            True if a changed configuration was loaded, False otherwise
+        """
+        if not self.config_manager.reload_if_changed():
+            return False
+        
+        # The categorizer keeps its own copy of the threshold from initialization
+        set_escalation_threshold(self.config_manager.options.confidence_threshold)
+        logger.info("Configuration file changed, reloaded processing options")
+        return True
+    
+    def _remember_processed(self, message_id: str) -> None:
+        """Record a processed Message-ID in the in-memory cache.
+        
+        Args:
+            message_id: Message-ID header of the processed email
+        """
+        with self._processed_lock:
+            self._processed_ids[message_id] = None
+            self._processed_ids.move_to_end(message_id)
+            if len(self._processed_ids) > PROCESSED_CACHE_SIZE:
+                self._processed_ids.popitem(last=False)
+    
+    def _forget_processed(self, message_ids: List[str]) -> None:
+        """Drop Message-IDs from the in-memory cache.
+        
+        Args:
+            message_ids: Message-IDs that must be looked up in the database again
+        """
+        with self._processed_lock:
+            for message_id in message_ids:
+                self._processed_ids.pop(message_id, None)
+    
+    def _filter_unprocessed(self, headers: Dict[int, Optional[str]]) -> List[int]:
+        """Drop emails that have already been processed.
+        
+        Message-IDs are checked against the in-memory cache first, and all
+        remaining ones are looked up in the state database with one bulk query.
+        
+        Args:
+            headers: Dictionary mapping message IDs to Message-IDs
+            
+        Returns:
+            Message IDs of the unprocessed emails, in the order given
+        """
+        known = set()
+        unknown = []
+        with self._processed_lock:
+            for message_id in headers.values():
+                if not message_id:
+                    continue
+                if message_id in self._processed_ids:
+                    self._processed_ids.move_to_end(message_id)
+                    known.add(message_id)
+                else:
+                    unknown.append(message_id)
+        
+        found = self.state_manager.get_processed_ids(unknown)
+        for message_id in found:
+            self._remember_processed(message_id)
+        
+        processed = known | found
+        return [
+            msg_id for msg_id, message_id in headers.items()
+            if not message_id or message_id not in processed
+        ]
+    
+    def _fetch_unprocessed(
+        self,
+        client: IMAPClient,
+        account: Account,
+        folder: str,
+        max_emails: int,
+        uid_next: Optional[int] = None
+    ) -> Tuple[Dict[int, Email], Optional[Tuple[int, int]]]:
+        """Fetch the unprocessed emails of a folder.
+        
+        Only Message-IDs are fetched for the whole folder; full messages are
+        fetched in one bulk FETCH for the emails that still need processing.
+        Once every email of a scan has been processed, later scans ask the
+        server only for emails added to the folder since then.
+        
+        Args:
+            client: The IMAPClient object
+            account: The account the folder belongs to
+            folder: The folder to read from
+            max_emails: Maximum number of recent emails to consider
+            uid_next: If given, only consider emails that arrived since this
+                UIDNEXT (the folder must still be selected)
+            
+        Returns:
+            Tuple of a dictionary mapping message IDs to unprocessed Email
+            objects, and the scan to pass to _record_scan once all of them have
+            been processed (None if the scan did not see the whole folder)
+        """
+        if uid_next is None:
+            last_scan = self.state_manager.get_last_scan(account.name, folder)
+            headers = self.imap_manager.get_email_headers(client, folder, max_emails, last_scan)
+            scan = self.imap_manager.get_complete_scan(client)
+        else:
+            headers = self.imap_manager.get_new_email_headers(client, folder, uid_next, max_emails)
+            scan = None
+        if not headers:
+            return {}, scan
+        
+        unprocessed_ids = self._filter_unprocessed(headers)
+        logger.debug(f"{len(unprocessed_ids)} of {len(headers)} emails in {folder} are unprocessed")
+        emails = self.imap_manager.fetch_email_bodies(client, folder, unprocessed_ids)
+        
+        # Only a scan that fetched every email it looked for may narrow the next one
+        if len(emails) != len(unprocessed_ids):
+            scan = None
+        return emails, scan
+    
+    def _record_scan(
+        self,
+        account: Account,
+        folder: str,
+        scan: Optional[Tuple[int, int]],
+        categorized_emails: Dict[int, Tuple[Email, str]],
+        category_counts: Dict[str, int]
+    ) -> None:
+        """Let later scans of a folder skip the emails it held at a complete scan.
+        
+        Nothing is recorded unless every email of the scan was processed, so
+        emails whose move failed are looked at again by the next scan.
+        
+        Args:
+            account: The account the folder belongs to
+            folder: The scanned folder
+            scan: The scan returned by _fetch_unprocessed
+            categorized_emails: The emails of the scan, as categorized
+            category_counts: Counts returned by process_categorized_emails
+        """
+        if scan is None or sum(category_counts.values()) != len(categorized_emails):
+            return
+        self.state_manager.set_last_scan(account.name, folder, *scan)
+    
+    def _mark_processed(self, email_objs: List[Email]) -> None:
+        """Mark emails as processed in the cache and queue them for the database.
+        
+        The cache is updated right away, so later scans skip these emails even
+        before the background writer has committed them.
+        
+        Args:
+            email_objs: The processed emails
+        """
+        message_ids = [email_obj.message_id for email_obj in email_objs if email_obj.message_id]
+        if not message_ids:
+            return
+        for message_id in message_ids:
+            self._remember_processed(message_id)
+        self._write_queue.put(message_ids)
+    
+    def _state_writer_loop(self) -> None:
+        """Write queued Message-IDs to the state database in batched transactions."""
+        while True:
+            pending = [self._write_queue.get()]
+            message_ids = list(pending[0])
+            
+            # Coalesce whatever else is already queued into the same transaction
+            while len(message_ids) < STATE_WRITE_BATCH_SIZE:
+                try:
+                    pending.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+                message_ids.extend(pending[-1])
+            
+            try:
+                self.state_manager.mark_emails_as_processed(message_ids)
+                logger.debug(f"Marked {len(message_ids)} emails as processed in database")
+            except Exception as e:
+                logger.error(f"Error marking {len(message_ids)} emails as processed: {e}")
+                # The cache must not claim what the database does not hold, or
+                # these emails would be skipped until the process restarts
+                self._forget_processed(message_ids)
+            finally:
+                for _ in pending:
+                    self._write_queue.task_done()
+    
+    def flush_state(self) -> None:
+        """Block until all queued state writes have been committed."""
+        self._write_queue.join()
+    
     def categorize_emails(
         self,
         client: IMAPClient,
@@ -61,7 +279,7 @@ class EmailProcessor:
             client: The IMAPClient object
             emails: Dictionary mapping message IDs to Email objects
             account: The EmailAccount object with category definitions
-            batch_size: Number of emails to categorize in each batch
+            batch_size: Number of emails per model batch
             
         Returns:
             Dictionary mapping message IDs to tuples of (Email, category)
@@ -69,50 +287,36 @@ class EmailProcessor:
         if not emails:
             return {}
         
-        # Convert Email objects to dictionaries for categorizer
-        email_dicts = {
-            msg_id: {
-                "subject": email.subject,
-                "from": email.from_addr,
-                "to": email.to_addr,
-                "date": email.date,
-                "body": email.body
-            } for msg_id, email in emails.items()
-        }
-        
-        # Prepare batches
         msg_ids = list(emails.keys())
-        categorized_emails = {}
         
-        # Process in batches
-        for i in range(0, len(msg_ids), batch_size):
-            batch_ids = msg_ids[i:i+batch_size]
-            batch_emails = [email_dicts[msg_id] for msg_id in batch_ids]
+        # One call for all emails: the categorizer packs its own model batches and
+        # tokenizes the next batch while the current one runs
+        try:
+            logger.info(f"Categorizing {len(msg_ids)} emails")
+            results = batch_categorize_emails_for_account(
+                [emails[msg_id].to_categorizer_dict() for msg_id in msg_ids],
+                account,
+                batch_size
+            )
+        except Exception as e:
+            logger.error(f"Error categorizing emails: {e}")
+            results = []
+        
+        categorized_emails = {}
+        for j, msg_id in enumerate(msg_ids):
+            email_obj = emails[msg_id]
+            if j < len(results):
+                # Get category name from result
+                category_name = results[j].get("category", "INBOX")
+            else:
+                # Fallback if result is missing
+                category_name = "INBOX"
+            categorized_emails[msg_id] = (email_obj, category_name)
             
-            try:
-                # Categorize batch
-                logger.info(f"Categorizing batch of {len(batch_emails)} emails")
-                results = batch_categorize_emails_for_account(
-                    batch_emails, 
-                    account, 
-                    batch_size
-                )
-                
-                # Process results
-                for j, msg_id in enumerate(batch_ids):
-                    if j < len(results):
-                        result = results[j]
-                        # Get category name from result
-                        category_name = result.get("category", "INBOX")
-                        categorized_emails[msg_id] = (emails[msg_id], category_name)
-                    else:
-                        # Fallback if result is missing
-                        categorized_emails[msg_id] = (emails[msg_id], "INBOX")
-            except Exception as e:
-                logger.error(f"Error categorizing batch: {e}")
-                # Fallback for the entire batch
-                for msg_id in batch_ids:
-                    categorized_emails[msg_id] = (emails[msg_id], "INBOX")
+            # Only headers are needed from here on; drop the content so large
+            # messages do not stay resident while they are moved and recorded
+            email_obj.body = ""
+            email_obj.raw_message = b""
         
         return categorized_emails
     
@@ -137,35 +341,38 @@ class EmailProcessor:
         # Initialize category counts
         category_counts = {category.name: 0 for category in account.categories}
         
-        # Process each email
+        # Emails to record in the database once all moves are done
+        processed_emails = []
+        
+        # Group emails by target folder so each folder takes a single bulk move
+        moves: Dict[str, List[int]] = {}
         for msg_id, (email_obj, category_name) in categorized_emails.items():
-            try:
-                move_successful = True
-                
-                # Move to appropriate folder if configured
-                if self.config_manager.options.move_emails:
-                    target_folder = account.get_folder_for_category(category_name)
-                    
-                    if target_folder and (current_folder is None or target_folder != current_folder):
-                        # Attempt to move the email
-                        move_successful = self.imap_manager.move_email(client, msg_id, target_folder)
-                        
-                        if not move_successful:
-                            logger.warning(f"Failed to move email {msg_id} to {target_folder}, skipping database update")
-                            continue
-                
-                # Only mark as processed in the database if the move was successful
-                # or if we're not configured to move emails
-                if move_successful:
-                    # Mark as processed in local state with category information
-                    self.state_manager.mark_email_as_processed(account.name, email_obj, category_name)
-                    
-                    # Update count for this category
-                    category_counts[category_name] = category_counts.get(category_name, 0) + 1
-                    
-                    logger.info(f"Email {msg_id} processed successfully and marked in database")
-            except Exception as e:
-                logger.error(f"Error processing email {msg_id}: {e}")
+            target_folder = None
+            if self.config_manager.options.move_emails:
+                target_folder = account.get_folder_for_category(category_name)
+            
+            if target_folder and (current_folder is None or target_folder != current_folder):
+                moves.setdefault(target_folder, []).append(msg_id)
+            else:
+                # Nothing to move, so the email only needs to be recorded
+                processed_emails.append(email_obj)
+                category_counts[category_name] = category_counts.get(category_name, 0) + 1
+        
+        moved = self.imap_manager.move_emails_bulk(client, moves, current_folder)
+        for target_folder, msg_ids in moves.items():
+            # Only mark as processed in the database if the move was successful
+            if not moved[target_folder]:
+                logger.warning(f"Failed to move {len(msg_ids)} emails to {target_folder}, skipping database update")
+                continue
+            
+            for msg_id in msg_ids:
+                email_obj, category_name = categorized_emails[msg_id]
+                processed_emails.append(email_obj)
+                category_counts[category_name] = category_counts.get(category_name, 0) + 1
+            logger.info(f"{len(msg_ids)} emails moved to {target_folder} successfully")
+        
+        # Mark as processed in local state (written in the background)
+        self._mark_processed(processed_emails)
         
         return category_counts
     
@@ -184,76 +391,92 @@ class EmailProcessor:
             return {}
         
         try:
-            # Get emails from source folder
-            emails = self.imap_manager.get_emails(
+            # Get unprocessed emails from source folder
+            unprocessed_emails, scan = self._fetch_unprocessed(
                 client,
+                account,
                 account.source_folder,
-                max_emails=account.max_emails
+                account.max_emails
             )
             
-            if not emails:
-                logger.info(f"No emails found in {account.source_folder}")
-                return {}
-            
-            # Filter out already processed emails
-            unprocessed_emails = {}
-            for msg_id, email in emails.items():
-                if not self.state_manager.is_processed(email.message_id):
-                    unprocessed_emails[msg_id] = email
-            
             if not unprocessed_emails:
                 logger.info("No unprocessed emails found")
+                self._record_scan(account, account.source_folder, scan, {}, {})
                 return {}
             
             # Categorize emails
-            categorized_emails = batch_categorize_emails_for_account(
-                list(unprocessed_emails.values()),
-                account
+            categorized_emails = self.categorize_emails(
+                client,
+                unprocessed_emails,
+                account,
+                self.config_manager.options.batch_size
             )
             
             # Move emails to category folders
-            results = {}
-            for category in account.categories:
-                results[category.name] = {"moved": 0}
-            
-            for msg_id, email in unprocessed_emails.items():
-                if email.message_id not in categorized_emails:
-                    continue
-                
-                category = categorized_emails[email.message_id]
-                target_folder = account.get_folder_for_category(category)
-                
-                if not target_folder:
-                    logger.warning(f"No folder found for category {category}")
-                    continue
-                
-                if self.imap_manager.move_email(client, msg_id, target_folder):
-                    results[category]["moved"] += 1
-                    self.state_manager.mark_processed(email.message_id)
+            category_counts = self.process_categorized_emails(
+                client,
+                categorized_emails,
+                account,
+                account.source_folder
+            )
+            self._record_scan(account, account.source_folder, scan, categorized_emails, category_counts)
             
-            return results
-        finally:
+            return {category: {"moved": count} for category, count in category_counts.items()}
+        except Exception:
+            # The connection stays pooled for the next run unless something went wrong
             self.imap_manager.disconnect(account.name)
+            raise
     
     def process_all_accounts(self) -> None:
-        """Process all configured accounts."""
-        for account in self.config_manager.accounts:
-            logger.info(f"Processing account: {account.name}")
-            results = self.process_account(account)
-            
-            for category, counts in results.items():
-                logger.info(f"Category {category}: moved {counts['moved']} emails")
+        """Process all configured accounts.
+        
+        A failing account does not stop the others; failures are raised
+        together once every account has been processed.
+        
+        Raises:
+            RuntimeError: If any account failed
+        """
+        accounts = self.config_manager.accounts
+        if not accounts:
+            return
+        
+        # Accounts are independent and mostly wait on their IMAP servers, so
+        # process several at once instead of one after another
+        failed = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(len(accounts), MAX_ACCOUNT_WORKERS),
+                thread_name_prefix="account"
+            ) as executor:
+                futures = {}
+                for account in accounts:
+                    logger.info(f"Processing account: {account.name}")
+                    futures[executor.submit(self.process_account, account)] = account
+                
+                for future in as_completed(futures):
+                    account = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing account {account.name}: {e}")
+                        failed.append(account.name)
+                        continue
+                    for category, counts in results.items():
+                        logger.info(f"{account.name}: category {category}: moved {counts['moved']} emails")
+        finally:
+            self.flush_state()
+        
+        if failed:
+            raise RuntimeError(f"Failed to process {len(failed)} of {len(accounts)} accounts: {', '.join(failed)}")
     
     def start_monitoring(self) -> None:
         """Start monitoring email accounts continuously."""
-        global running
-        running = True
+        self._stop_event.clear()
         
         # Set up signal handler for graceful shutdown
         def signal_handler(sig, frame):
-            global running
             logger.debug("Received shutdown signal, stopping...")
-            running = False
+            self._stop_event.set()
         
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
@@ -269,14 +492,17 @@ class EmailProcessor:
             thread.start()
             threads.append(thread)
         
-        # Wait for threads to complete
+        # Sleep until a shutdown signal, waking only to pick up edits to the config
+        # file. Options apply on the monitors' next pass; accounts are fixed at startup.
         try:
-            while running and any(t.is_alive() for t in threads):
-                time.sleep(1)
+            while not self._stop_event.wait(CONFIG_RELOAD_INTERVAL) and any(t.is_alive() for t in threads):
+                self._reload_config()
         finally:
-            running = False
+            self._stop_event.set()
             for thread in threads:
                 thread.join(timeout=5)
+            self.imap_manager.disconnect_all()
+            self.flush_state()
     
     def _monitor_account(self, account: Account) -> None:
         """Monitor an email account continuously.
@@ -284,41 +510,31 @@ class EmailProcessor:
         Args:
             account: The email account to monitor
         """
-        global running
-        
-        while running:
+        while not self._stop_event.is_set():
             try:
                 # Connect to account
                 client = self.imap_manager.connect(account)
                 if not client:
                     logger.error(f"Failed to connect to {account}, retrying in 60 seconds")
-                    time.sleep(60)
+                    self._stop_event.wait(60)
                     continue
                 
                 try:
                     # Process each folder
                     for folder in account.folders:
-                        if not running:
+                        if self._stop_event.is_set():
                             break
                         
                         try:
-                            # Select folder
-                            client.select_folder(folder)
-                            
                             # First, process all existing emails in the folder
                             logger.info(f"Processing existing emails in {folder}")
-                            emails = self.imap_manager.get_emails(
+                            unprocessed_emails, scan = self._fetch_unprocessed(
                                 client, 
+                                account,
                                 folder, 
                                 self.config_manager.options.max_emails_per_run
                             )
                             
-                            # Filter out already processed emails
-                            unprocessed_emails = {}
-                            for msg_id, email_obj in emails.items():
-                                if not self.state_manager.is_email_processed(account.name, email_obj):
-                                    unprocessed_emails[msg_id] = email_obj
-                            
                             if unprocessed_emails:
                                 logger.info(f"Found {len(unprocessed_emails)} unprocessed emails in {folder}")
                                 # Categorize emails
@@ -330,19 +546,24 @@ class EmailProcessor:
                                 )
                                 
                                 # Process categorized emails
-                                self.process_categorized_emails(
+                                category_counts = self.process_categorized_emails(
                                     client,
                                     categorized_emails,
                                     account,
                                     folder
                                 )
+                                self._record_scan(account, folder, scan, categorized_emails, category_counts)
                             else:
                                 logger.debug(f"No unprocessed emails found in {folder}")
+                                self._record_scan(account, folder, scan, {}, {})
+                            
+                            # IDLE watches the selected folder, which is not this one if its
+                            # SELECT (or the re-select after moving emails) failed
+                            if self.imap_manager.get_selected_folder(client) != folder:
+                                raise RuntimeError(f"{folder} is not selected, not waiting for new emails")
                             
-                            # Get the current message count before IDLE
-                            pre_idle_messages = client.search(['ALL'])
-                            pre_idle_count = len(pre_idle_messages)
-                            logger.debug(f"Current message count before IDLE: {pre_idle_count}")
+                            # Anything that arrives from here on gets a UID of at least this
+                            uid_next = self.imap_manager.get_uid_next(client)
                             
                             # Now enter IDLE mode to wait for new emails
                             logger.debug(f"Waiting for new emails in {folder}")
@@ -363,32 +584,20 @@ class EmailProcessor:
                                     logger.debug(f"Detected new email: {response}")
                                     break
                             
-                            # Double-check by comparing message counts
-                            post_idle_messages = client.search(['ALL'])
-                            post_idle_count = len(post_idle_messages)
-                            logger.debug(f"Message count after IDLE: {post_idle_count}")
-                            
-                            if post_idle_count > pre_idle_count:
-                                logger.debug(f"New messages detected: {post_idle_count - pre_idle_count}")
-                                has_new_emails = True
-                            
                             # Always check for new emails after IDLE, even if no EXISTS notification
                             # This helps catch emails that might have been missed
                             logger.debug(f"Checking for new emails after IDLE (has_new_emails={has_new_emails})")
                             
-                            # Get all emails again
-                            emails = self.imap_manager.get_emails(
+                            # Get the unprocessed emails again; with a known UIDNEXT only
+                            # the emails that arrived during IDLE need to be looked at
+                            unprocessed_emails, _ = self._fetch_unprocessed(
                                 client, 
+                                account,
                                 folder, 
-                                self.config_manager.options.max_emails_per_run
+                                self.config_manager.options.max_emails_per_run,
+                                uid_next
                             )
                             
-                            # Filter out already processed emails
-                            unprocessed_emails = {}
-                            for msg_id, email_obj in emails.items():
-                                if not self.state_manager.is_email_processed(account.name, email_obj):
-                                    unprocessed_emails[msg_id] = email_obj
-                            
                             if unprocessed_emails:
                                 logger.info(f"Found {len(unprocessed_emails)} unprocessed emails after IDLE")
                                 # Categorize emails
@@ -410,13 +619,14 @@ class EmailProcessor:
                                 logger.debug(f"No unprocessed emails found after IDLE")
                         except Exception as e:
                             logger.error(f"Error monitoring folder {folder}: {e}")
-                            time.sleep(60)  # Wait before retrying
-                finally:
-                    # Disconnect
+                            self._stop_event.wait(60)  # Wait before retrying, unless stopping
+                except Exception:
+                    # Keep the connection across IDLE cycles; only drop it after a failure
                     self.imap_manager.disconnect(account.name)
+                    raise
             except Exception as e:
                 logger.error(f"Error in monitoring loop for {account}: {e}")
-                time.sleep(60)  # Wait before retrying
+                self._stop_event.wait(60)  # Wait before retrying, unless stopping
 
 
 def main(config_path: str, daemon_mode: bool = False) -> None:
@@ -434,7 +644,10 @@ def main(config_path: str, daemon_mode: bool = False) -> None:
             processor.start_monitoring()
         else:
             logger.info("Processing emails (one-time run)")
-            processor.process_all_accounts()
+            try:
+                processor.process_all_accounts()
+            finally:
+                processor.imap_manager.disconnect_all()
     except Exception as e:
         logger.error(f"Error in main: {e}")
         sys.exit(1) 
\ No newline at end of file
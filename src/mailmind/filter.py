@@ -20,16 +20,10 @@ def filter_emails(
     if not filters:
         return emails
     
-    filtered_emails = []
+    # Bind the criteria once so the per-email test is a single generator over pairs
+    criteria = tuple(filters.items())
     
-    for email in emails:
-        matches = True
-        for key, value in filters.items():
-            if key not in email or value not in email[key]:
-                matches = False
-                break
-        
-        if matches:
-            filtered_emails.append(email)
-    
-    return filtered_emails 
\ No newline at end of file
+    return [
+        email for email in emails
+        if all(key in email and value in email[key] for key, value in criteria)
+    ]
@@ -1,44 +1,124 @@
 """Manages IMAP connections and folder operations."""
 
-import email
+import email.parser
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from imapclient import IMAPClient
 
-from .models import Email, EmailAccount
+from .inference.models import Account, Email
 
 logger = logging.getLogger(__name__)
 
+# Pooled connections checked within this many seconds are reused without a NOOP
+NOOP_INTERVAL = 60
+
+# Bytes of body text decoded per email; the categorizer only reads the start of the body
+MAX_BODY_BYTES = 64 * 1024
+
+# Bytes fetched per message; attachments past this point are never downloaded
+MAX_FETCH_BYTES = 256 * 1024
+
+# Search keys ORed into a single SEARCH when looking up moved emails
+SEARCH_BATCH_SIZE = 50
+
+# Parsers shared by all fetches; both are stateless between calls. The
+# message parser uses the same compat32 policy as email.message_from_bytes.
+_MESSAGE_PARSER = email.parser.BytesParser()
+_HEADER_PARSER = email.parser.BytesHeaderParser()
+
+# IMAP flag marking an email as read
+_SEEN = b'\\Seen'
+
+# Messages per body FETCH, bounding how much raw response data is held at once
+FETCH_CHUNK_SIZE = 200
+
+def _any_of(search_keys: List[list]) -> list:
+    """Combine IMAP search keys into one criteria list matching any of them.
+    
+    The keys are nested into a balanced tree of OR terms, which keeps the
+    nesting depth logarithmic in the number of keys.
+    
+    Args:
+        search_keys: Non-empty list of search keys, each a list of tokens
+        
+    Returns:
+        Search criteria for IMAPClient.search
+    """
+    if len(search_keys) == 1:
+        return search_keys[0]
+    middle = len(search_keys) // 2
+    return ['OR', _any_of(search_keys[:middle]), _any_of(search_keys[middle:])]
+
+
 class IMAPManager:
     """Manages IMAP connections and folder operations."""
     
     def __init__(self):
         """Initialize the IMAP manager."""
         self.connections: Dict[str, IMAPClient] = {}
+        self._last_checked: Dict[str, float] = {}
+        
+        # Accounts are processed on several threads at once; this guards the
+        # pool and the per-connection caches below, never a network round trip
+        self._lock = threading.Lock()
+        
+        # Folder names known to exist, per connection, so moves skip the LIST round trip
+        self._known_folders: "weakref.WeakKeyDictionary[IMAPClient, Set[str]]" = weakref.WeakKeyDictionary()
+        
+        # Folder each connection has selected, absent while a SELECT is pending or after it failed
+        self._selected_folders: "weakref.WeakKeyDictionary[IMAPClient, str]" = weakref.WeakKeyDictionary()
+        
+        # UIDNEXT of the folder each connection last selected through _select_recent
+        self._uid_next: "weakref.WeakKeyDictionary[IMAPClient, int]" = weakref.WeakKeyDictionary()
+        
+        # (UIDVALIDITY, UID to resume from) of each connection's last header scan, see get_complete_scan
+        self._complete_scans: "weakref.WeakKeyDictionary[IMAPClient, Tuple[int, int]]" = weakref.WeakKeyDictionary()
     
-    def connect(self, account: EmailAccount) -> Optional[IMAPClient]:
+    def connect(self, account: Account) -> Optional[IMAPClient]:
         """Connect to an IMAP server.
         
         Args:
             account: The email account to connect to
             
+        Connections are kept per account and reused by later calls until
+        disconnect or disconnect_all is called. A pooled connection is checked
+        with NOOP at most once every NOOP_INTERVAL seconds.
+        
         Returns:
             An IMAPClient object if connection successful, None otherwise
         """
+        # Reuse a pooled connection if it still answers; LOGIN and TLS are the expensive part
+        with self._lock:
+            client = self.connections.get(account.name)
+            last_checked = self._last_checked.get(account.name, 0.0)
+        if client is not None:
+            if time.monotonic() - last_checked < NOOP_INTERVAL:
+                return client
+            try:
+                client.noop()
+                with self._lock:
+                    self._last_checked[account.name] = time.monotonic()
+                logger.debug(f"Reusing connection to {account}")
+                return client
+            except Exception as e:
+                logger.debug(f"Pooled connection to {account} is stale ({e}), reconnecting")
+                self.disconnect(account.name)
+        
         try:
-            # Check if already connected
-            if account.name in self.connections and self.connections[account.name].is_connected:
-                logger.debug(f"Already connected to {account}")
-                return self.connections[account.name]
-            
             # Create new connection
             logger.debug(f"Connecting to {account}")
             client = IMAPClient(account.imap_server, port=account.imap_port, ssl=account.ssl)
             client.login(account.email_address, account.password)
             
             # Store connection
-            self.connections[account.name] = client
+            with self._lock:
+                self.connections[account.name] = client
+                self._last_checked[account.name] = time.monotonic()
             logger.debug(f"Connected to {account}")
             return client
         except Exception as e:
@@ -51,33 +131,65 @@ class IMAPManager:
         Args:
             account_name: Name of the account to disconnect from
         """
-        if account_name in self.connections:
-            try:
-                self.connections[account_name].logout()
-                logger.debug(f"Disconnected from {account_name}")
-            except Exception as e:
-                logger.error(f"Error disconnecting from {account_name}: {e}")
-            finally:
-                del self.connections[account_name]
+        with self._lock:
+            client = self.connections.pop(account_name, None)
+            self._last_checked.pop(account_name, None)
+            if client is None:
+                return
+            self._known_folders.pop(client, None)
+            self._selected_folders.pop(client, None)
+            self._uid_next.pop(client, None)
+            self._complete_scans.pop(client, None)
+        
+        try:
+            client.logout()
+            logger.debug(f"Disconnected from {account_name}")
+        except Exception as e:
+            logger.error(f"Error disconnecting from {account_name}: {e}")
     
     def disconnect_all(self) -> None:
         """Disconnect from all IMAP servers."""
-        for account_name in list(self.connections.keys()):
+        with self._lock:
+            account_names = list(self.connections.keys())
+        for account_name in account_names:
             self.disconnect(account_name)
     
     def ensure_folder_exists(self, client: IMAPClient, folder: str) -> None:
         """Ensure a folder exists, create it if it doesn't.
         
+        The folder list is fetched once per connection and cached.
+        
         Args:
             client: The IMAPClient object
             folder: The folder name to check/create
         """
-        folders = [f.decode() if isinstance(f, bytes) else f for f in client.list_folders()]
-        folder_names = [f[2] for f in folders]
+        with self._lock:
+            folder_names = self._known_folders.get(client)
+        if folder_names is None:
+            # LIST once per connection; folders created later are added below
+            folder_names = {f[2] for f in client.list_folders()}
+            with self._lock:
+                self._known_folders[client] = folder_names
         
         if folder not in folder_names:
-            logger.debug(f"Creating folder: {folder}")
-            client.create_folder(folder)
+            # Also reached for a folder forgotten after a failed move, which may still exist
+            if not client.folder_exists(folder):
+                logger.debug(f"Creating folder: {folder}")
+                client.create_folder(folder)
+            with self._lock:
+                folder_names.add(folder)
+    
+    def _forget_folder(self, client: IMAPClient, folder: str) -> None:
+        """Drop a folder from the client's cached folder list.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The folder name to forget
+        """
+        with self._lock:
+            folder_names = self._known_folders.get(client)
+            if folder_names is not None:
+                folder_names.discard(folder)
     
     def move_email(self, client: IMAPClient, msg_id: int, target_folder: str) -> bool:
         """Move an email to a target folder without changing its read/unread status.
@@ -90,121 +202,537 @@ class IMAPManager:
         Returns:
             True if successful, False otherwise
         """
+        return self.move_emails(client, [msg_id], target_folder)
+    
+    def move_emails(
+        self,
+        client: IMAPClient,
+        msg_ids: List[int],
+        target_folder: str,
+        source_folder: Optional[str] = None
+    ) -> bool:
+        """Move emails to a target folder without changing their read/unread status.
+        
+        Args:
+            client: The IMAPClient object
+            msg_ids: The message IDs to move
+            target_folder: The target folder to move to
+            source_folder: Folder to re-select afterwards, so later message IDs
+                still refer to it (restoring unread flags selects the target)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.move_emails_bulk(client, {target_folder: msg_ids}, source_folder)[target_folder]
+    
+    @staticmethod
+    def _pop_copyuid(client: IMAPClient) -> Dict[int, int]:
+        """Take the COPYUID response code (RFC 4315) left by the last MOVE or COPY.
+        
+        imapclient does not expose response codes, so they are read from the
+        underlying imaplib connection, which files them as untagged responses.
+        
+        Args:
+            client: The IMAPClient object
+            
+        Returns:
+            Dictionary mapping source UIDs to UIDs in the target folder (empty
+            if the server sent no COPYUID or the client does not use UIDs)
+        """
+        imap = getattr(client, '_imap', None)
+        if imap is None or not getattr(client, 'use_uid', False):
+            return {}
+        
+        def expand(uid_set: str) -> List[int]:
+            uids: List[int] = []
+            for part in uid_set.split(','):
+                first_text, _, last_text = part.partition(':')
+                first_uid = int(first_text)
+                last_uid = int(last_text) if last_text else first_uid
+                uids.extend(range(min(first_uid, last_uid), max(first_uid, last_uid) + 1))
+            return uids
+        
+        new_uids: Dict[int, int] = {}
+        for data in imap.untagged_responses.pop('COPYUID', None) or []:
+            try:
+                _, source_set, target_set = (data.decode() if isinstance(data, bytes) else data).split()
+                new_uids.update(zip(expand(source_set), expand(target_set)))
+            except ValueError:
+                logger.debug(f"Ignoring malformed COPYUID response: {data!r}")
+        return new_uids
+    
+    def move_emails_bulk(
+        self,
+        client: IMAPClient,
+        msg_ids_by_folder: Dict[str, List[int]],
+        source_folder: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """Move emails to several target folders without changing their read/unread status.
+        
+        The flags of all emails are fetched with a single FETCH and each folder
+        takes a single MOVE, instead of a round trip per email. All moves run
+        before any unread flags are restored, so the source folder only has to
+        be re-selected once at the end.
+        
+        Args:
+            client: The IMAPClient object
+            msg_ids_by_folder: Dictionary mapping target folders to message IDs
+            source_folder: Folder to re-select afterwards, so later message IDs
+                still refer to it (restoring unread flags selects the target)
+            
+        Returns:
+            Dictionary mapping each target folder to whether its move succeeded
+        """
+        moved = {folder: False for folder in msg_ids_by_folder}
+        all_ids = [msg_id for msg_ids in msg_ids_by_folder.values() for msg_id in msg_ids]
+        if not all_ids:
+            return {folder: True for folder in msg_ids_by_folder}
+        
         try:
-            # Ensure target folder exists
-            self.ensure_folder_exists(client, target_folder)
-            
-            # Check if the message is unread before moving
-            response = client.fetch([msg_id], ['FLAGS', 'ENVELOPE'])
-            is_unread = b'\\Seen' not in response[msg_id][b'FLAGS']
-            
-            # Get message identifiers to find it after moving
-            envelope = response[msg_id][b'ENVELOPE']
-            message_id = envelope.message_id
-            subject = envelope.subject
-            date = envelope.date
-            
-            # Move the message
-            client.move(msg_id, target_folder)
-            logger.info(f"Moved email {msg_id} to {target_folder}")
-            
-            # If the message was unread, make sure it stays unread in the target folder
-            if is_unread:
-                # Select the target folder
-                client.select_folder(target_folder)
+            # Check which messages are unread before moving
+            response = client.fetch(all_ids, ['FLAGS', 'ENVELOPE'])
+        except Exception as e:
+            logger.error(f"Error fetching flags for {len(all_ids)} emails: {e}")
+            return moved
+        
+        # Envelopes of the unread emails, found in one pass over the response
+        unread = {
+            msg_id: data[b'ENVELOPE'] for msg_id, data in response.items()
+            if _SEEN not in data[b'FLAGS']
+        }
+        del response
+        
+        # Do every MOVE while the source folder is still selected
+        unread_by_folder = {}
+        for target_folder, msg_ids in msg_ids_by_folder.items():
+            if not msg_ids:
+                moved[target_folder] = True
+                continue
+            
+            try:
+                # Ensure target folder exists
+                self.ensure_folder_exists(client, target_folder)
                 
-                # Search for the message in the target folder using message-id header
+                # Move the messages
+                self._pop_copyuid(client)
+                client.move(msg_ids, target_folder)
+                moved[target_folder] = True
+                logger.info(f"Moved {len(msg_ids)} emails to {target_folder}")
+            except Exception as e:
+                logger.error(f"Error moving {len(msg_ids)} emails to {target_folder}: {e}")
+                # The folder may have been deleted or renamed since it was listed;
+                # forget it so the next move checks again and recreates it
+                self._forget_folder(client, target_folder)
+                continue
+            
+            unread_ids = [msg_id for msg_id in msg_ids if msg_id in unread]
+            if unread_ids:
+                unread_by_folder[target_folder] = (unread_ids, self._pop_copyuid(client))
+        
+        # Then make sure unread messages stay unread in each target folder
+        for target_folder, (unread_ids, new_uids) in unread_by_folder.items():
+            try:
+                self._select_folder(client, target_folder)
+            except Exception as e:
+                logger.error(f"Error selecting {target_folder} to preserve unread status: {e}")
+                continue
+            
+            # The MOVE's COPYUID response names the new UIDs directly, so those
+            # are restored first, whatever happens to the searches below
+            self._mark_unread(client, [new_uids[msg_id] for msg_id in unread_ids if msg_id in new_uids], target_folder)
+            
+            # Only emails COPYUID did not cover are looked up with a search
+            search_keys = []
+            for msg_id in unread_ids:
+                if msg_id in new_uids:
+                    continue
+                envelope = unread[msg_id]
+                message_id = envelope.message_id
+                subject = envelope.subject
                 if message_id:
-                    # Search by Message-ID header
-                    search_criteria = ['HEADER', 'Message-ID', message_id.decode('utf-8', errors='ignore')]
-                    messages = client.search(search_criteria)
-                elif subject and date:
-                    # Fallback: search by subject and date
+                    # Search by Message-ID header, sending the envelope's bytes as they are
+                    search_keys.append(['HEADER', 'Message-ID', message_id])
+                elif subject and envelope.date:
+                    # Fallback: search by subject
                     subject_str = subject.decode('utf-8', errors='ignore') if isinstance(subject, bytes) else str(subject)
-                    search_criteria = ['SUBJECT', subject_str]
-                    messages = client.search(search_criteria)
-                else:
-                    # Last resort: get recent messages
-                    messages = client.search(['RECENT'])
-                
-                if messages:
-                    # Remove the Seen flag to keep it unread
-                    client.remove_flags(messages, [b'\\Seen'])
-                    logger.debug(f"Preserved unread status for {len(messages)} emails in {target_folder}")
+                    search_keys.append(['SUBJECT', subject_str.encode('utf-8')])
             
-            return True
+            # OR the keys together, so a batch of emails takes one SEARCH; a
+            # failed batch only loses the emails it was looking for
+            messages = set()
+            for start in range(0, len(search_keys), SEARCH_BATCH_SIZE):
+                batch = search_keys[start:start + SEARCH_BATCH_SIZE]
+                # imapclient ignores the charset for nested criteria, so non-ASCII
+                # keys are passed as UTF-8 bytes and the charset is named here
+                charset = None if all(key[-1].isascii() for key in batch) else 'UTF-8'
+                try:
+                    messages.update(client.search(_any_of(batch), charset=charset))
+                except Exception as e:
+                    logger.error(f"Error searching {target_folder} for {len(batch)} moved emails: {e}")
+            self._mark_unread(client, list(messages), target_folder)
+        
+        if unread_by_folder and source_folder:
+            try:
+                self._select_folder(client, source_folder)
+            except Exception as e:
+                logger.error(f"Error re-selecting {source_folder}: {e}")
+        
+        return moved
+    
+    @staticmethod
+    def _mark_unread(client: IMAPClient, msg_ids: List[int], folder: str) -> None:
+        """Remove the Seen flag from emails in the selected folder, logging failures.
+        
+        Args:
+            client: The IMAPClient object
+            msg_ids: The message IDs to mark as unread
+            folder: The selected folder, for logging
+        """
+        if not msg_ids:
+            return
+        try:
+            # SILENT skips the server echoing back every message's new flags
+            client.remove_flags(msg_ids, [_SEEN], silent=True)
+            logger.debug(f"Preserved unread status for {len(msg_ids)} emails in {folder}")
         except Exception as e:
-            logger.error(f"Error moving email {msg_id} to {target_folder}: {e}")
-            return False
+            logger.error(f"Error preserving unread status in {folder}: {e}")
     
-    def get_emails(
-        self, client: IMAPClient, folder: str, max_emails: int
-    ) -> Dict[int, Email]:
-        """Get all emails from a folder without marking them as read.
+    def _select_folder(self, client: IMAPClient, folder: str) -> dict:
+        """Select a folder, keeping track of which folder each connection has selected.
         
         Args:
             client: The IMAPClient object
-            folder: The folder to fetch emails from
-            max_emails: Maximum number of emails to fetch
+            folder: The folder to select
             
         Returns:
-            Dictionary mapping message IDs to Email objects
+            The SELECT response, see IMAPClient.select_folder
         """
-        try:
-            # Select the folder
-            client.select_folder(folder)
-            logger.debug(f"Selected folder: {folder}")
+        # Forget the old folder first, so a failed SELECT leaves no folder selected
+        with self._lock:
+            self._selected_folders.pop(client, None)
+        status = client.select_folder(folder) or {}
+        with self._lock:
+            self._selected_folders[client] = folder
+        logger.debug(f"Selected folder: {folder}")
+        return status
+    
+    def get_selected_folder(self, client: IMAPClient) -> Optional[str]:
+        """Get the folder the client has selected.
+        
+        Args:
+            client: The IMAPClient object
             
-            # Search for all emails in the folder
+        Returns:
+            The selected folder, or None if the last SELECT failed
+        """
+        with self._lock:
+            return self._selected_folders.get(client)
+    
+    def _select_recent(
+        self,
+        client: IMAPClient,
+        folder: str,
+        max_emails: int,
+        last_scan: Optional[Tuple[int, int]] = None
+    ) -> List[int]:
+        """Select a folder and return its most recent message IDs, newest first.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The folder to select
+            max_emails: Maximum number of message IDs to return
+            last_scan: If given, the (UIDVALIDITY, UIDNEXT) of the last complete
+                scan; only emails added to the folder since then are returned
+            
+        Returns:
+            List of message IDs
+            
+        Raises:
+            Exception: If the folder could not be selected or searched; after
+                a failed SELECT the connection has no folder and no UIDNEXT
+        """
+        # Drop the previous folder's UIDNEXT before selecting, so a failed SELECT can't leave it behind
+        with self._lock:
+            self._uid_next.pop(client, None)
+            self._complete_scans.pop(client, None)
+        
+        # Select the folder, remembering UIDNEXT so later scans can ask for new mail only
+        status = self._select_folder(client, folder)
+        uid_validity = status.get(b'UIDVALIDITY')
+        uid_next = status.get(b'UIDNEXT')
+        if uid_next:
+            with self._lock:
+                self._uid_next[client] = uid_next
+        
+        # Every email added since the last scan, whether delivered, moved or appended,
+        # has a UID of at least that scan's UIDNEXT. A new UIDVALIDITY means the
+        # server renumbered the folder, so it has to be searched in full.
+        use_uid = getattr(client, 'use_uid', False)
+        if last_scan and use_uid and uid_validity == last_scan[0]:
+            # "n:*" always matches the highest UID, even when it is below n
+            messages = [msg_id for msg_id in client.search(['UID', f'{last_scan[1]}:*']) if msg_id >= last_scan[1]]
+        else:
             messages = client.search(['ALL'])
-            logger.debug(f"Found {len(messages)} emails in {folder}")
+        logger.debug(f"Found {len(messages)} emails in {folder}")
+        
+        # Sort messages by ID (higher IDs are more recent)
+        messages.sort(reverse=True)
+        
+        # Limit the number of emails (most recent first)
+        resume_uid = uid_next
+        if max_emails > 0 and len(messages) > max_emails:
+            logger.debug(f"Limiting to {max_emails} most recent emails")
+            messages = messages[:max_emails]
+            # Only the newest emails are ever looked at, so a capped scan
+            # resumes above the highest UID it returned, like a full one
+            resume_uid = messages[0] + 1
+        if use_uid and uid_validity and resume_uid:
+            with self._lock:
+                self._complete_scans[client] = (uid_validity, resume_uid)
+        
+        if not messages:
+            logger.debug(f"No messages to fetch from {folder}")
+        return messages
+    
+    def get_uid_next(self, client: IMAPClient) -> Optional[int]:
+        """Get the UIDNEXT reported when the client last selected a folder here.
+        
+        Args:
+            client: The IMAPClient object
+            
+        Returns:
+            The UID the next new message will get, or None if the server did not say
+        """
+        if not getattr(client, 'use_uid', False):
+            # UIDNEXT is only useful to callers that address messages by UID
+            return None
+        with self._lock:
+            return self._uid_next.get(client)
+    
+    def get_complete_scan(self, client: IMAPClient) -> Optional[Tuple[int, int]]:
+        """Get where the client's last get_email_headers call can be resumed from.
+        
+        Args:
+            client: The IMAPClient object
             
-            # Sort messages by ID (higher IDs are more recent)
-            messages.sort(reverse=True)
+        Returns:
+            The folder's UIDVALIDITY and the UID the next scan can start at (its
+            UIDNEXT, or above the newest email returned when max_emails capped
+            the scan), or None if the last call failed or did not use UIDs
+        """
+        with self._lock:
+            return self._complete_scans.get(client)
+    
+    def _fetch_message_ids(self, client: IMAPClient, msg_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Fetch the Message-ID header of emails in the selected folder.
+        
+        Args:
+            client: The IMAPClient object
+            msg_ids: The message IDs to fetch
             
-            # Limit the number of emails (most recent first)
-            if max_emails > 0 and len(messages) > max_emails:
-                logger.debug(f"Limiting to {max_emails} most recent emails")
-                messages = messages[:max_emails]
+        Returns:
+            Dictionary mapping message IDs to Message-IDs (None if missing)
+        """
+        # One FETCH of a single header field for the whole message set
+        response = client.fetch(msg_ids, ['BODY.PEEK[HEADER.FIELDS (MESSAGE-ID)]'])
+        
+        headers = {}
+        for msg_id, data in response.items():
+            header_bytes = next(
+                (value for key, value in data.items() if isinstance(key, bytes) and key.startswith(b'BODY')),
+                None
+            )
+            message_id = None
+            if header_bytes:
+                message_id = str(_HEADER_PARSER.parsebytes(header_bytes).get("Message-ID") or "").strip() or None
+            headers[msg_id] = message_id
+        
+        return headers
+    
+    def get_email_headers(
+        self,
+        client: IMAPClient,
+        folder: str,
+        max_emails: int,
+        last_scan: Optional[Tuple[int, int]] = None
+    ) -> Dict[int, Optional[str]]:
+        """Get the Message-ID header of the most recent emails in a folder.
+        
+        Only the Message-ID header is fetched, so callers can drop emails they
+        have already processed before paying for the full messages.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The folder to select and read from
+            max_emails: Maximum number of emails to return
+            last_scan: If given, the (UIDVALIDITY, UIDNEXT) of the last complete
+                scan, see get_complete_scan
             
-            # Fetch email data
+        Returns:
+            Dictionary mapping message IDs to Message-IDs (None if missing)
+        """
+        try:
+            messages = self._select_recent(client, folder, max_emails, last_scan)
             if not messages:
-                logger.debug(f"No messages to fetch from {folder}")
                 return {}
+            return self._fetch_message_ids(client, messages)
+        except Exception as e:
+            logger.error(f"Error fetching headers from {folder}: {e}")
+            with self._lock:
+                self._complete_scans.pop(client, None)
+            return {}
+    
+    def get_new_email_headers(
+        self, client: IMAPClient, folder: str, uid_next: int, max_emails: int = 0
+    ) -> Dict[int, Optional[str]]:
+        """Get the Message-ID header of emails that arrived since UIDNEXT was read.
+        
+        Searches only the UID range from ``uid_next`` upwards, so the cost
+        depends on the number of new emails rather than the folder size. The
+        folder must already be selected and the client must use UIDs.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The currently selected folder
+            uid_next: UIDNEXT from before the wait, see get_uid_next
+            max_emails: Maximum number of emails to return (0 for no limit)
             
-            logger.debug(f"Fetching {len(messages)} emails from {folder}")
-            # Use BODY.PEEK[] instead of BODY[] to avoid marking emails as read
-            raw_emails = client.fetch(messages, ['ENVELOPE', 'BODY.PEEK[]'])
+        Returns:
+            Dictionary mapping message IDs to Message-IDs (None if missing)
+        """
+        try:
+            # "n:*" always matches the highest UID, even when it is below n
+            messages = [msg_id for msg_id in client.search(['UID', f'{uid_next}:*']) if msg_id >= uid_next]
+            logger.debug(f"Found {len(messages)} new emails in {folder}")
+            if not messages:
+                return {}
+            if max_emails > 0 and len(messages) > max_emails:
+                messages = sorted(messages, reverse=True)[:max_emails]
+            return self._fetch_message_ids(client, messages)
+        except Exception as e:
+            logger.error(f"Error fetching new headers from {folder}: {e}")
+            return {}
+    
+    def _parse_emails(self, folder: str, raw_emails: Dict[int, dict]) -> List[Tuple[int, Email]]:
+        """Convert one FETCH response of full messages to Email objects.
+        
+        Args:
+            folder: The folder the messages were fetched from
+            raw_emails: FETCH response mapping message IDs to their data items
             
-            # Convert to Email objects
-            emails = {}
-            for msg_id, data in raw_emails.items():
+        Returns:
+            List of (message ID, Email object) tuples
+        """
+        emails = []
+        for msg_id, data in raw_emails.items():
+            try:
+                # Servers answer a partial BODY.PEEK[] with a BODY[]<0> item
+                raw_message = data.get(b'BODY[]<0>')
+                if raw_message is None:
+                    # Try alternative keys that might be returned by the server
+                    body_key = next(
+                        (key for key in data if isinstance(key, bytes) and key.startswith(b'BODY')),
+                        None
+                    )
+                    if body_key is None:
+                        logger.error(f"No body data found for email {msg_id}. Available keys: {list(data.keys())}")
+                        continue
+                    raw_message = data[body_key]
+                
+                if len(raw_message) >= MAX_FETCH_BYTES:
+                    # Truncated: drop the partial last line, so base64 and
+                    # quoted-printable text parts still decode cleanly
+                    raw_message = raw_message[:raw_message.rfind(b'\n') + 1]
+                
+                email_obj = Email.from_message(
+                    _MESSAGE_PARSER.parsebytes(raw_message), msg_id, raw_message, MAX_BODY_BYTES
+                )
+                email_obj.folder = folder
+                emails.append((msg_id, email_obj))
+            except Exception as e:
+                logger.error(f"Error processing email {msg_id}: {e}")
+        return emails
+    
+    def iter_email_bodies(
+        self, client: IMAPClient, folder: str, msg_ids: List[int], chunk_size: int = FETCH_CHUNK_SIZE
+    ) -> Iterator[Tuple[int, Email]]:
+        """Fetch full emails from the selected folder without marking them as read.
+        
+        Messages are fetched ``chunk_size`` at a time and each chunk's raw
+        response is released once it has been parsed, so the transient FETCH
+        data never covers the whole message set. Each chunk is parsed on a
+        worker thread while the next chunk's FETCH waits on the server.
+        Messages longer than MAX_FETCH_BYTES are truncated, and so is their
+        raw_message.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The currently selected folder (recorded on each email)
+            msg_ids: The message IDs to fetch
+            chunk_size: Number of messages per FETCH
+            
+        Yields:
+            Tuples of (message ID, Email object)
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="mime-parse") as executor:
+            parsing = None
+            for start in range(0, len(msg_ids), chunk_size):
+                chunk = msg_ids[start:start + chunk_size]
                 try:
-                    # Check if the key exists in the data
-                    if b'BODY.PEEK[]' not in data:
-                        # Try alternative keys that might be returned by the server
-                        body_key = None
-                        for key in data.keys():
-                            if isinstance(key, bytes) and b'BODY' in key:
-                                body_key = key
-                                break
-                        
-                        if body_key is None:
-                            logger.error(f"No body data found for email {msg_id}. Available keys: {list(data.keys())}")
-                            continue
-                        
-                        message = email.message_from_bytes(data[body_key])
-                    else:
-                        # The key is present as expected
-                        message = email.message_from_bytes(data[b'BODY.PEEK[]'])
-                    
-                    emails[msg_id] = Email.from_message(message, msg_id)
-                    emails[msg_id].folder = folder
+                    logger.debug(f"Fetching {len(chunk)} emails from {folder}")
+                    # BODY.PEEK[] avoids marking emails as read; the headers are
+                    # parsed from the body, so no ENVELOPE is needed. Only the first
+                    # MAX_FETCH_BYTES are requested, which covers headers and text
+                    # parts while leaving most attachment data on the server.
+                    raw_emails = client.fetch(chunk, [f'BODY.PEEK[]<0.{MAX_FETCH_BYTES}>'])
                 except Exception as e:
-                    logger.error(f"Error processing email {msg_id}: {e}")
+                    logger.error(f"Error fetching emails from {folder}: {e}")
+                    continue
+                
+                # Hand the previous chunk's results over, then parse this one
+                # in the background while the next FETCH is on the wire
+                if parsing is not None:
+                    yield from parsing.result()
+                parsing = executor.submit(self._parse_emails, folder, raw_emails)
+                del raw_emails
             
+            if parsing is not None:
+                yield from parsing.result()
+    
+    def fetch_email_bodies(
+        self, client: IMAPClient, folder: str, msg_ids: List[int]
+    ) -> Dict[int, Email]:
+        """Fetch full emails from the selected folder without marking them as read.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The currently selected folder (recorded on each email)
+            msg_ids: The message IDs to fetch
+            
+        Returns:
+            Dictionary mapping message IDs to Email objects
+        """
+        emails = dict(self.iter_email_bodies(client, folder, msg_ids))
+        if emails:
             logger.debug(f"Successfully processed {len(emails)} emails from {folder} without marking as read")
-            return emails
+        return emails
+    
+    def get_emails(
+        self, client: IMAPClient, folder: str, max_emails: int
+    ) -> Dict[int, Email]:
+        """Get all emails from a folder without marking them as read.
+        
+        Args:
+            client: The IMAPClient object
+            folder: The folder to fetch emails from
+            max_emails: Maximum number of emails to fetch
+            
+        Returns:
+            Dictionary mapping message IDs to Email objects
+        """
+        try:
+            messages = self._select_recent(client, folder, max_emails)
         except Exception as e:
             logger.error(f"Error fetching emails from {folder}: {e}")
-            return {} 
\ No newline at end of file
+            return {}
+        return self.fetch_email_bodies(client, folder, messages)
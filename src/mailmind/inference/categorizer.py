@@ -1,12 +1,19 @@
 """Email categorization using trained model."""
 
 import os
+import re
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
 import torch
-from transformers import AutoTokenizer
 
 from ..training.model import EmailCategorizationModel
 
@@ -16,20 +23,94 @@ logger = logging.getLogger(__name__)
 # Fixed model path
 MODEL_PATH = Path(__file__).parent / "models" / "email-classifier-v2"
 
+# Quoted reply lines ("> ...") repeat earlier mail and carry no category signal
+_QUOTED_LINES = re.compile(r"^>.*(?:\n|$)", re.MULTILINE)
+
+# Upper bound on characters per token, used to cap the body before tokenizing
+_MAX_CHARS_PER_TOKEN = 8
+
+# Typical characters per token, used to estimate padded batch sizes before tokenizing
+_CHARS_PER_TOKEN_ESTIMATE = 4
+
+
+@lru_cache(maxsize=1)
+def _load_model(model_dir: str, device: str, config_mtime_ns: int) -> EmailCategorizationModel:
+    """Load the categorization model, reusing it across categorizer instances.
+    
+    The modification time of the saved config is part of the cache key, so
+    re-initializing after the model has been retrained loads the new weights.
+    
+    Args:
+        model_dir: Directory containing the saved model
+        device: Device to load the model on
+        config_mtime_ns: Modification time of the model's config.json
+        
+    Returns:
+        Loaded model
+    """
+    return EmailCategorizationModel.load(Path(model_dir), device)
+
+
 class EmailCategorizer:
     """Categorizes emails using trained model."""
     
-    def __init__(self):
-        """Initialize the email categorizer."""
+    def __init__(
+        self,
+        max_length: int = 512,
+        primary_max_length: int = 128,
+        escalation_threshold: float = 60.0,
+        cache_size: int = 10000
+    ):
+        """Initialize the email categorizer.
+        
+        Emails are first classified from a short prefix of ``primary_max_length``
+        tokens, which is much cheaper to run. Only emails whose confidence falls
+        below ``escalation_threshold`` are re-run with the full ``max_length``.
+        
+        Args:
+            max_length: Maximum number of tokens used for a full pass
+            primary_max_length: Number of tokens used for the cheap first pass
+            escalation_threshold: Confidence (0-100) below which an email is re-run
+            cache_size: Maximum number of results kept in the content-hash cache
+        """
+        self.max_length = max_length
+        self.primary_max_length = min(primary_max_length, max_length)
+        self.escalation_threshold = escalation_threshold
+        self.max_body_chars = max_length * _MAX_CHARS_PER_TOKEN
         self.model_dir = MODEL_PATH
         self.device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
         
-        # Load model and tokenizer
-        self.model = EmailCategorizationModel.load(self.model_dir, self.device)
-        self.tokenizer = AutoTokenizer.from_pretrained("microsoft/phi-2")
+        # Results keyed by _dedup_key, so recurring templated mail skips the model
+        self.cache_size = cache_size
+        self._result_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Load model (cached across re-initializations) and reuse its tokenizer,
+        # which is already configured with a padding token
+        config_mtime_ns = (self.model_dir / "config.json").stat().st_mtime_ns
+        self.model = _load_model(str(self.model_dir), self.device, config_mtime_ns)
+        self.tokenizer = self.model.tokenizer
+        
+        # Category name of each label id, as saved with the model
+        self._labels = self.model.labels
         
         logger.info(f"Loaded model from {self.model_dir} using {self.device} device")
     
+    def set_escalation_threshold(self, escalation_threshold: float) -> None:
+        """Change the confidence below which emails are re-run at full length.
+        
+        Cached results were escalated against the old threshold, so the cache
+        is cleared when the threshold changes.
+        
+        Args:
+            escalation_threshold: Confidence (0-100) below which an email is re-run
+        """
+        if escalation_threshold == self.escalation_threshold:
+            return
+        with self._cache_lock:
+            self.escalation_threshold = escalation_threshold
+            self._result_cache.clear()
+    
     def _prepare_email_text(self, email: Dict[str, str]) -> str:
         """Prepare email text for the model.
         
@@ -43,63 +124,368 @@ class EmailCategorizer:
 To: {email.get('to', '')}
 Subject: {email.get('subject', '')}
 Date: {email.get('date', '')}
-Body: {email.get('body', '')}"""
+Body: {self._prepare_body(email.get('body', ''))}"""
+    
+    def _prepare_body(self, body: str) -> str:
+        """Bound the email body before it is tokenized.
+        
+        The tokenizer truncates to max_length tokens anyway, but only after
+        tokenizing the whole text, so a large newsletter would be tokenized in
+        full just to be thrown away. Quoted reply lines are dropped first so the
+        remaining budget goes to the new content.
+        
+        Args:
+            body: Email body text
+            
+        Returns:
+            Body without quoted lines, capped to what max_length tokens can hold
+        """
+        body = _QUOTED_LINES.sub("", body[:self.max_body_chars * 2])
+        return body[:self.max_body_chars]
+    
+    def _tokenize_batch(self, batch_texts: List[str], max_length: int) -> Any:
+        """Tokenize a batch of prepared email texts for the model.
+        
+        Args:
+            batch_texts: List of texts built by _prepare_email_text
+            max_length: Maximum number of tokens per email
+            
+        Returns:
+            Tokenized batch as PyTorch tensors (still on the CPU)
+        """
+        return self.tokenizer(
+            batch_texts,
+            padding=True,
+            truncation=True,
+            max_length=max_length,
+            return_tensors="pt"
+        )
+    
+    @staticmethod
+    def _dedup_key(email: Dict[str, str]) -> bytes:
+        """Build a key identifying emails that will be categorized identically.
+        
+        Args:
+            email: Dictionary containing email fields
+            
+        Returns:
+            Digest of the sender, subject and full body
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for field in ("from", "subject", "body"):
+            digest.update((email.get(field) or "").encode("utf-8", errors="replace"))
+            # Separator keeps ("ab", "c") and ("a", "bc") from colliding
+            digest.update(b"\0")
+        return digest.digest()
     
     def categorize_emails(self, emails: List[Dict[str, str]], batch_size: int = 8) -> List[Dict[str, Any]]:
         """Categorize a batch of emails.
         
+        Identical emails (same sender, subject and body), as produced by
+        newsletters and mailing lists, are only run through the model once and
+        the result is copied to every duplicate. Results are also kept in an LRU
+        cache so the same email seen in a later call is not re-classified.
+        
         Args:
             emails: List of email dictionaries
             batch_size: Batch size for processing
             
         Returns:
-            List of dictionaries with categorization results
+            List of dictionaries with categorization results, in input order
         """
-        results = []
+        groups: Dict[bytes, List[int]] = {}
+        for index, email in enumerate(emails):
+            groups.setdefault(self._dedup_key(email), []).append(index)
+        
+        # Split unique emails into cache hits and misses in a single pass
+        group_results: Dict[bytes, Dict[str, Any]] = {}
+        misses: List[bytes] = []
+        with self._cache_lock:
+            for key in groups:
+                cached = self._result_cache.get(key)
+                if cached is None:
+                    misses.append(key)
+                else:
+                    self._result_cache.move_to_end(key)
+                    group_results[key] = cached
+        
+        if len(misses) < len(emails):
+            logger.debug(
+                f"Categorizing {len(misses)} emails out of {len(emails)} "
+                f"({len(groups)} unique, {len(group_results)} cached)"
+            )
+        
+        if misses:
+            miss_results = self._categorize_unique([emails[groups[key][0]] for key in misses], batch_size)
+            with self._cache_lock:
+                for key, result in zip(misses, miss_results):
+                    group_results[key] = result
+                    self._result_cache[key] = result
+                while len(self._result_cache) > self.cache_size:
+                    self._result_cache.popitem(last=False)
+        
+        results_by_index = {
+            index: dict(group_results[key]) for key, indices in groups.items() for index in indices
+        }
+        return [results_by_index[index] for index in range(len(emails))]
+    
+    def _categorize_unique(self, emails: List[Dict[str, str]], batch_size: int) -> List[Dict[str, Any]]:
+        """Categorize emails with a cheap first pass and escalate uncertain ones.
         
-        # Process in batches
-        for i in range(0, len(emails), batch_size):
-            batch = emails[i:i + batch_size]
-            batch_texts = [self._prepare_email_text(email) for email in batch]
+        Args:
+            emails: List of email dictionaries
+            batch_size: Batch size for processing
             
-            # Tokenize
-            inputs = self.tokenizer(
-                batch_texts,
-                padding=True,
-                truncation=True,
-                max_length=512,
-                return_tensors="pt"
-            ).to(self.device)
+        Returns:
+            List of dictionaries with categorization results
+        """
+        results = self._run_model(emails, batch_size, self.primary_max_length)
+        if self.primary_max_length >= self.max_length:
+            return results
+        
+        # Re-run low-confidence emails with the full context
+        escalate = [i for i, result in enumerate(results) if result["confidence"] < self.escalation_threshold]
+        if escalate:
+            logger.debug(f"Escalating {len(escalate)} of {len(emails)} emails to a full-length pass")
+            escalated_results = self._run_model([emails[i] for i in escalate], batch_size, self.max_length)
+            for i, result in zip(escalate, escalated_results):
+                results[i] = result
+        
+        return results
+    
+    def _run_model(self, emails: List[Dict[str, str]], batch_size: int, max_length: int) -> List[Dict[str, Any]]:
+        """Run emails through the model.
+        
+        Emails are batched in order of text length so each batch pads to a similar
+        size instead of to its single longest email. Batches are packed against a
+        padded-token budget of ``batch_size * max_length``, so runs of short emails
+        share one larger forward pass while long emails keep to ``batch_size``.
+        Tokenization of the next batch runs on a worker thread while the model
+        processes the current one, so CPU-side text preparation overlaps inference.
+        
+        Args:
+            emails: List of email dictionaries
+            batch_size: Number of full-length emails per batch
+            max_length: Maximum number of tokens per email
             
-            # Get predictions
-            with torch.no_grad():
-                outputs = self.model.forward(**inputs)
-                predictions = outputs["predictions"].cpu().numpy()
-                logits = outputs["logits"].cpu().numpy()
-                probabilities = torch.nn.functional.softmax(torch.tensor(logits), dim=-1).numpy()
+        Returns:
+            List of dictionaries with categorization results, in input order
+        """
+        if not emails:
+            return []
+        
+        # Sort (length, index) pairs once; batches are then contiguous slices
+        texts = map(self._prepare_email_text, emails)
+        ordered = sorted((len(text), index, text) for index, text in enumerate(texts))
+        order = [index for _, index, _ in ordered]
+        sorted_texts = [text for _, _, text in ordered]
+        
+        # Greedily pack batches; the newest email is always the longest in its batch
+        budget = batch_size * max_length
+        bounds = []
+        start = 0
+        for end, (length, _, _) in enumerate(ordered):
+            padded_tokens = min(max_length, length // _CHARS_PER_TOKEN_ESTIMATE + 1)
+            if end > start and (end - start + 1) * padded_tokens > budget:
+                bounds.append((start, end))
+                start = end
+        bounds.append((start, len(order)))
+        
+        results_by_index: Dict[int, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first_start, first_end = bounds[0]
+            pending = executor.submit(self._tokenize_batch, sorted_texts[first_start:first_end], max_length)
             
-            # Convert predictions to categories
-            for j, pred in enumerate(predictions):
-                category = self.model.id_to_category[pred]
-                confidence = float(probabilities[j][pred]) * 100
+            # Process in batches
+            for batch_number, (start, end) in enumerate(bounds):
+                inputs = pending.result().to(self.device)
                 
-                results.append({
-                    "category": category,
-                    "confidence": confidence,
-                    "reasoning": f"Model confidence: {confidence:.1f}%"
-                })
+                # Prefetch the next batch while this one runs through the model
+                if batch_number + 1 < len(bounds):
+                    next_start, next_end = bounds[batch_number + 1]
+                    pending = executor.submit(
+                        self._tokenize_batch, sorted_texts[next_start:next_end], max_length
+                    )
+                
+                # Get predictions
+                with torch.no_grad():
+                    outputs = self.model.forward(**inputs)
+                    # Softmax and argmax on the device, then a single transfer of two small vectors
+                    top_probability_tensor, prediction_tensor = torch.softmax(outputs["logits"], dim=-1).max(dim=-1)
+                    top_probabilities = top_probability_tensor.cpu().tolist()
+                    predictions = prediction_tensor.cpu().tolist()
+                
+                # Convert predictions to categories
+                labels = self._labels
+                for email_index, pred, probability in zip(order[start:end], predictions, top_probabilities):
+                    confidence = probability * 100
+                    results_by_index[email_index] = {
+                        "category": labels[pred],
+                        "confidence": confidence,
+                        "reasoning": f"Model confidence: {confidence:.1f}%"
+                    }
         
-        return results
+        return [results_by_index[index] for index in range(len(emails))]
 
 
-# Global categorizer instance
-_global_categorizer = None
+class CategorizerService:
+    """Runs a categorizer on a single worker thread, shared by all callers.
+    
+    Callers on other threads submit lists of emails and wait on a future.
+    Requests that arrive within ``max_wait_ms`` of each other are merged
+    into one categorizer call, so emails from several accounts share model
+    batches and the model is never driven from two threads at once.
+    """
+    
+    def __init__(self, categorizer: EmailCategorizer, max_wait_ms: float = 20, max_batch: int = 64):
+        """Initialize the service and start its worker thread.
+        
+        Args:
+            categorizer: The categorizer to run requests on
+            max_wait_ms: How long to wait for more requests before running
+            max_batch: Number of emails after which a merged run starts immediately
+        """
+        self.categorizer = categorizer
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._requests: "queue.Queue[Optional[Tuple[List[Dict[str, str]], int, Future]]]" = queue.Queue()
+        
+        # Set once close() has queued the stop sentinel; nothing may be queued after it
+        self._closed = False
+        self._closed_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="categorizer", daemon=True)
+        self._worker.start()
+    
+    def submit(self, emails: List[Dict[str, str]], batch_size: int = 8) -> "Future[List[Dict[str, Any]]]":
+        """Queue emails for categorization.
+        
+        Args:
+            emails: List of email dictionaries
+            batch_size: Batch size for processing
+            
+        Returns:
+            Future resolving to the categorization results, in input order
+            
+        Raises:
+            RuntimeError: If the service has been closed
+        """
+        future: Future = Future()
+        with self._closed_lock:
+            if self._closed:
+                raise RuntimeError("Categorizer service is closed")
+            self._requests.put((emails, batch_size, future))
+        return future
+    
+    def close(self) -> None:
+        """Stop the worker thread once queued requests are done."""
+        with self._closed_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(None)
+    
+    def _run(self) -> None:
+        """Run requests until close(), then fail any the worker did not get to."""
+        try:
+            self._serve()
+        finally:
+            with self._closed_lock:
+                self._closed = True
+            while True:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is not None:
+                    request[2].set_exception(RuntimeError("Categorizer service stopped"))
+    
+    def _serve(self) -> None:
+        """Merge queued requests and run them through the categorizer."""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            requests = [request]
+            total = len(request[0])
+            
+            # Give requests from other threads a moment to join this run
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while total < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+                total += len(request[0])
+            
+            emails = [email for request_emails, _, _ in requests for email in request_emails]
+            try:
+                results = self.categorizer.categorize_emails(emails, max(size for _, size, _ in requests))
+            except Exception as e:
+                for _, _, future in requests:
+                    future.set_exception(e)
+            else:
+                start = 0
+                for request_emails, _, future in requests:
+                    future.set_result(results[start:start + len(request_emails)])
+                    start += len(request_emails)
+            
+            if stop:
+                return
+
+
+# Global categorizer instance and the service that runs it, replaced together under the lock
+_global_categorizer: Optional[EmailCategorizer] = None
+_global_service: Optional[CategorizerService] = None
+_global_lock = threading.Lock()
+
+
+def _replace_categorizer(**kwargs: Any) -> CategorizerService:
+    """Replace the global categorizer and its service; the caller holds _global_lock.
+    
+    Args:
+        **kwargs: Options forwarded to EmailCategorizer
+        
+    Returns:
+        The new service
+    """
+    global _global_categorizer, _global_service
+    _global_categorizer = EmailCategorizer(**kwargs)
+    
+    # Route all callers through one worker for the new categorizer
+    if _global_service is not None:
+        _global_service.close()
+    _global_service = CategorizerService(_global_categorizer)
+    return _global_service
+
+
+def initialize_categorizer(**kwargs: Any) -> None:
+    """Initialize the global categorizer instance.
+    
+    Args:
+        **kwargs: Options forwarded to EmailCategorizer (e.g. escalation_threshold)
+    """
+    with _global_lock:
+        _replace_categorizer(**kwargs)
 
 
-def initialize_categorizer() -> None:
-    """Initialize the global categorizer instance."""
-    global _global_categorizer
-    _global_categorizer = EmailCategorizer()
+def set_escalation_threshold(escalation_threshold: float) -> None:
+    """Change the escalation threshold of the global categorizer, if there is one.
+    
+    Args:
+        escalation_threshold: Confidence (0-100) below which an email is re-run
+    """
+    with _global_lock:
+        categorizer = _global_categorizer
+    if categorizer is not None:
+        categorizer.set_escalation_threshold(escalation_threshold)
 
 
 def batch_categorize_emails_for_account(
@@ -117,10 +503,14 @@ def batch_categorize_emails_for_account(
     Returns:
         List of dictionaries with categorization results
     """
-    global _global_categorizer
-    
-    # Create categorizer if it doesn't exist
-    if not _global_categorizer:
-        initialize_categorizer()
+    with _global_lock:
+        # Create categorizer if it doesn't exist
+        service = _global_service or _replace_categorizer()
+        if not emails:
+            return []
+        
+        # Submitting under the lock means the service can't be replaced and closed in between
+        future = service.submit(emails, batch_size)
     
-    return _global_categorizer.categorize_emails(emails, batch_size) 
\ No newline at end of file
+    # Calls from concurrent account threads are merged on the service's worker
+    return future.result()
@@ -1,30 +1,60 @@
 """Command-line interface for mailmind."""
 
 import argparse
+import atexit
 import json
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, List, Optional
 from pathlib import Path
 
 from .models import Account, Category, ProcessingOptions
-from .categorizer import initialize_categorizer
-from mailmind.email_processor import main as email_processor_main
 from mailmind.sqlite_state_manager import SQLiteStateManager
 from mailmind.filter import filter_emails
 
 # Version information
 __version__ = "1.0.0"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stdout
-)
 logger = logging.getLogger(__name__)
 
+# Shared by every console handler the CLI installs
+_LOG_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_CONSOLE_HANDLER_NAME = "mailmind_console"
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure console logging for the CLI.
+    
+    Records are handed to a background listener thread through a queue, so
+    the IMAP and categorization threads never block on writing to stdout.
+    
+    Safe to call more than once: the handler is only installed if it is not
+    already attached, so records are never formatted twice.
+    
+    Args:
+        level: Log level for the root logger
+    """
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    if any(handler.get_name() == _CONSOLE_HANDLER_NAME for handler in root_logger.handlers):
+        return
+    
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(_LOG_FORMATTER)
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    # Flush queued records before the interpreter exits
+    atexit.register(listener.stop)
+    
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.set_name(_CONSOLE_HANDLER_NAME)
+    root_logger.addHandler(queue_handler)
+
 
 def handle_version_command(args):
     """Handle the version command."""
@@ -33,6 +63,9 @@ def handle_version_command(args):
 
 def handle_categorize_command(args):
     """Handle the categorize command."""
+    # Deferred: the categorizer pulls in torch and transformers
+    from .categorizer import initialize_categorizer, batch_categorize_emails_for_account
+    
     try:
         # Load emails from input file
         with open(args.input, "r") as f:
@@ -65,19 +98,12 @@ def handle_categorize_command(args):
             ]
         )
         
-        # Categorize emails
+        # Categorize all emails in one call; the categorizer batches internally
+        results = batch_categorize_emails_for_account(emails, mock_account, args.batch_size)
+        
         if args.category != "all":
             logger.debug(f"Filtering by category: {args.category}")
             
-            # Categorize all emails
-            results = []
-            for i in range(0, len(emails), args.batch_size):
-                batch = emails[i:i+args.batch_size]
-                batch_results = categorizer.batch_categorize_emails_for_account(
-                    batch, mock_account, args.batch_size, args.model
-                )
-                results.extend(batch_results)
-            
             # Filter by category
             filtered_emails = []
             for i, email in enumerate(emails):
@@ -92,20 +118,10 @@ def handle_categorize_command(args):
         else:
             logger.debug("Categorizing emails")
             
-            # Categorize all emails
+            # Group by category
             all_results = {cat.name.lower(): [] for cat in mock_account.categories}
-            
-            for i in range(0, len(emails), args.batch_size):
-                batch = emails[i:i+args.batch_size]
-                batch_results = categorizer.batch_categorize_emails_for_account(
-                    batch, mock_account, args.batch_size, args.model
-                )
-                
-                # Group by category
-                for j, email in enumerate(batch):
-                    if j < len(batch_results):
-                        category = batch_results[j]["category"].lower()
-                        all_results[category].append(email)
+            for email, result in zip(emails, results):
+                all_results[result["category"].lower()].append(email)
             
             # Write results to output file
             with open(args.output, "w") as f:
@@ -121,6 +137,9 @@ def handle_categorize_command(args):
 
 def handle_imap_command(args):
     """Handle the imap command."""
+    # Deferred: the processor pulls in imapclient and the categorizer
+    from mailmind.email_processor import main as email_processor_main
+    
     try:
         # Run the email processor
         email_processor_main(args.config, args.daemon)
@@ -235,13 +254,17 @@ def handle_state_command(args):
             else:
                 logger.warning("This will reset the state for all accounts. All emails will be reprocessed.")
                 if args.force or input("Are you sure? (y/n): ").lower() == "y":
-                    # Get the database path
+                    # Get the database path and release the open connection to it
                     db_path = state_manager.db_file_path
+                    state_manager.close()
                     
-                    # Delete the database file and recreate it
+                    # Delete the database file (and its WAL side files) and recreate it
                     if os.path.exists(db_path):
                         os.remove(db_path)
                         logger.debug("State database deleted")
+                    for suffix in ("-wal", "-shm"):
+                        if os.path.exists(db_path + suffix):
+                            os.remove(db_path + suffix)
                     
                     # Reinitialize the database
                     state_manager = SQLiteStateManager(db_path)
@@ -254,6 +277,13 @@ def handle_state_command(args):
 
 def main():
     """Main entry point for the CLI."""
+    # Answer a bare version request before building the parser
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        handle_version_command(None)
+        return
+    
+    setup_logging()
+    
     parser = argparse.ArgumentParser(description="Email filtering and categorization tool")
     
     # Add version argument
@@ -1,16 +1,44 @@
 """Data models for email processing."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from email.message import Message
 
-@dataclass
+def _add_slots(cls: type) -> type:
+    """Recreate a dataclass with ``__slots__`` for its fields.
+    
+    Stands in for ``dataclass(slots=True)``, which needs Python 3.10. Fields
+    must not have defaults, since a slot can't share its name with a class
+    attribute.
+    """
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = tuple(f.name for f in fields(cls))
+    # Slotted instances have neither, so the old descriptors must not be carried over
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_add_slots
+@dataclass(frozen=True)
 class Category:
-    """Represents an email category with its properties."""
+    """Represents an email category with its properties.
+    
+    Categories are immutable and slotted, which keeps them small and hashable.
+    """
     name: str
     description: str
     foldername: str
+    # Computed once for case-insensitive lookups; not part of equality, hash or repr
+    name_upper: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "name_upper", self.name.upper())
+    
+    def __reduce__(self) -> Tuple[type, Tuple[str, str, str]]:
+        # Rebuild through __init__; the default slot-by-slot restore trips over frozen=True
+        return (self.__class__, (self.name, self.description, self.foldername))
     
     def __str__(self) -> str:
         return self.name
@@ -26,51 +54,78 @@ class Email:
     raw_message: bytes
     msg_id: Optional[int] = None
     folder: Optional[str] = None
+    message_id: Optional[str] = None
     
     @classmethod
-    def from_message(cls, message: Message, msg_id: Optional[int] = None) -> 'Email':
-        """Create an Email instance from an email.message.Message."""
+    def from_message(
+        cls,
+        message: Message,
+        msg_id: Optional[int] = None,
+        raw_message: Optional[bytes] = None,
+        max_body_bytes: Optional[int] = None
+    ) -> 'Email':
+        """Create an Email instance from an email.message.Message.
+        
+        Pass the bytes the message was parsed from as ``raw_message`` when they
+        are at hand; otherwise the whole message is serialized again. With
+        ``max_body_bytes`` only that many bytes of body text are decoded.
+        """
         return cls(
             subject=message.get("Subject", ""),
             from_addr=message.get("From", ""),
             to_addr=message.get("To", ""),
             date=message.get("Date", ""),
-            body=cls._extract_body(message),
-            raw_message=message.as_bytes(),
-            msg_id=msg_id
+            body=cls._extract_body(message, max_body_bytes),
+            raw_message=message.as_bytes() if raw_message is None else raw_message,
+            msg_id=msg_id,
+            message_id=str(message.get("Message-ID") or "").strip() or None
         )
     
+    def to_categorizer_dict(self) -> Dict[str, str]:
+        """Get the fields the categorizer reads, in its dictionary format."""
+        return {
+            "subject": self.subject,
+            "from": self.from_addr,
+            "to": self.to_addr,
+            "date": self.date,
+            "body": self.body
+        }
+    
     @staticmethod
-    def _extract_body(message: Message) -> str:
-        """Extract the body from an email message."""
-        if message.is_multipart():
-            text_parts = []
-            for part in message.walk():
-                content_type = part.get_content_type()
+    def _extract_body(message: Message, max_bytes: Optional[int] = None) -> str:
+        """Extract the body from an email message.
+        
+        Args:
+            message: The parsed email message
+            max_bytes: Maximum number of payload bytes to decode (None for all)
+        """
+        parts = message.walk() if message.is_multipart() else [message]
+        text_parts = []
+        remaining = max_bytes
+        for part in parts:
+            if message.is_multipart():
                 content_disposition = str(part.get("Content-Disposition"))
-                
-                if "attachment" in content_disposition:
+                if "attachment" in content_disposition or part.get_content_type() != "text/plain":
                     continue
-                
-                if content_type == "text/plain":
-                    try:
-                        charset = part.get_content_charset() or "utf-8"
-                        payload = part.get_payload(decode=True)
-                        if payload:
-                            text_parts.append(payload.decode(charset, errors="replace"))
-                    except Exception:
-                        continue
             
-            return "\n".join(text_parts)
-        else:
             try:
-                charset = message.get_content_charset() or "utf-8"
-                payload = message.get_payload(decode=True)
-                if payload:
-                    return payload.decode(charset, errors="replace")
-                return ""
+                charset = part.get_content_charset() or "utf-8"
+                payload = part.get_payload(decode=True)
+                if not isinstance(payload, bytes) or not payload:
+                    continue
+                head: Union[bytes, memoryview] = payload
+                if remaining is not None:
+                    # Decode only the head of the payload, without copying the bytes first
+                    head = memoryview(payload)[:remaining]
+                    remaining -= len(head)
+                text_parts.append(str(head, charset, "replace"))
             except Exception:
-                return ""
+                continue
+            
+            if remaining is not None and remaining <= 0:
+                break
+        
+        return "\n".join(text_parts)
 
 @dataclass
 class Account:
@@ -99,6 +154,10 @@ class Account:
                 Category("UPDATES", "Updates and notifications", "[Updates]"),
                 Category("INBOX", "Important emails that need attention", "INBOX")
             ]
+        
+        # Categories by upper-cased name, for get_category_by_name
+        self._categories_by_name: Dict[str, Category] = {}
+        self._invalidate_category_index()
     
     def __str__(self) -> str:
         return f"{self.name} ({self.email_address})"
@@ -107,13 +166,14 @@ class Account:
         """Get list of category names for this account."""
         return [category.name for category in self.categories]
     
+    def _invalidate_category_index(self) -> None:
+        """Rebuild the name index; call after replacing or editing ``categories``."""
+        # Built in reverse so the first definition of a name wins
+        self._categories_by_name = {category.name_upper: category for category in reversed(self.categories)}
+    
     def get_category_by_name(self, name: str) -> Optional[Category]:
         """Get a category by its name."""
-        name_upper = name.upper()
-        for category in self.categories:
-            if category.name.upper() == name_upper:
-                return category
-        return None
+        return self._categories_by_name.get(name.upper())
     
     def get_folder_for_category(self, category_name: str) -> str:
         """Get the folder name for a given category."""
@@ -130,6 +190,7 @@ class ProcessingOptions:
     idle_timeout: int = 1740  # 29 minutes
     move_emails: bool = True
     model: str = "gpt-4o-mini"  # Default to GPT-4o mini
+    confidence_threshold: float = 60.0  # Re-run emails below this confidence with full context
     
     def __post_init__(self):
         pass 
\ No newline at end of file
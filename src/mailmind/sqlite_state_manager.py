@@ -3,14 +3,39 @@
 import logging
 import os
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .inference.models import Email
 
 logger = logging.getLogger(__name__)
 
+# Stay well below SQLite's default limit of 999 bound parameters per statement
+_MAX_QUERY_PARAMS = 900
+
+# State directories already created by this process, so repeated managers skip the mkdir syscalls
+_READY_STATE_DIRS: Set[str] = set()
+
+
+def _default_db_path() -> str:
+    """Resolve the default database path and make sure its directory exists.
+    
+    Returns:
+        Path to the default SQLite database file
+    """
+    # Use environment variable if set, otherwise use default path
+    state_dir = os.environ.get('MAILMIND_STATE_DIR') or os.path.expanduser("~/.mailmind")
+    
+    # Create state directory if it doesn't exist
+    if state_dir not in _READY_STATE_DIRS:
+        os.makedirs(state_dir, exist_ok=True)
+        _READY_STATE_DIRS.add(state_dir)
+    
+    return os.path.join(state_dir, "processed_emails.db")
+
+
 class SQLiteStateManager:
     """Manages local state using SQLite database."""
     
@@ -21,23 +46,66 @@ class SQLiteStateManager:
             db_file_path: Path to SQLite database file
         """
         if db_file_path is None:
-            # Use environment variable if set, otherwise use default path
-            state_dir = os.environ.get('MAILMIND_STATE_DIR', os.path.expanduser("~/.mailmind"))
-            db_file_path = os.path.join(state_dir, "processed_emails.db")
-            
-            # Create state directory if it doesn't exist
-            os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+            db_file_path = _default_db_path()
         
         self.db_file_path = db_file_path
         
+        # One connection per thread, opened on first use and then kept until close()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        
         # Initialize database
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection to the state database.
+        
+        Each thread keeps its own connection, so lookups skip the open and
+        PRAGMA round on every call while WAL still lets one thread read as
+        another writes. In WAL mode (set once in _init_db) NORMAL synchronous
+        is still safe against corruption and skips the fsync on every commit.
+        
+        Connections are keyed by thread ident, so a thread started after
+        another one ended may take over its connection; each one is still only
+        used by one thread at a time.
+        
+        Returns:
+            SQLite connection
+        """
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is None:
+            # close() runs on whichever thread calls it, so the check for the
+            # creating thread has to be off
+            conn = sqlite3.connect(self.db_file_path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            with self._connections_lock:
+                self._connections[thread_id] = conn
+        return conn
+    
+    def close(self) -> None:
+        """Close the connections of all threads.
+        
+        Threads that use the manager again afterwards open new connections.
+        No other thread may be in the middle of a query while this runs.
+        """
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+    
     def _init_db(self) -> None:
         """Initialize the SQLite database."""
-        with sqlite3.connect(self.db_file_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
+            # Write-ahead logging lets readers proceed while the writer commits;
+            # the mode is stored in the database file, so it only needs setting once
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Create table for processed emails
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS processed_emails (
@@ -47,10 +115,23 @@ class SQLiteStateManager:
                 )
             """)
             
-            # Create index for message_id
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_message_id ON processed_emails(message_id)")
+            # message_id is already indexed through its UNIQUE constraint; a second
+            # index on the same column only doubles the work of every insert
+            cursor.execute("DROP INDEX IF EXISTS idx_message_id")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_processed_date ON processed_emails(processed_date)")
             
+            # UIDVALIDITY and UIDNEXT of the last complete scan per folder, so scans
+            # can ask the server for newly added mail only
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS folder_scans (
+                    account TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    uid_validity INTEGER NOT NULL,
+                    uid_next INTEGER NOT NULL,
+                    PRIMARY KEY (account, folder)
+                )
+            """)
+            
             conn.commit()
     
     def is_processed(self, message_id: str) -> bool:
@@ -62,7 +143,7 @@ class SQLiteStateManager:
         Returns:
             True if the email has been processed, False otherwise
         """
-        with sqlite3.connect(self.db_file_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute(
@@ -72,13 +153,42 @@ class SQLiteStateManager:
             
             return cursor.fetchone() is not None
     
+    def get_processed_ids(self, message_ids: Iterable[str]) -> Set[str]:
+        """Find which of the given emails have been processed, in bulk.
+        
+        Args:
+            message_ids: Message IDs to check
+            
+        Returns:
+            The subset of message_ids that have been processed
+        """
+        message_ids = list(dict.fromkeys(message_ids))
+        processed: Set[str] = set()
+        if not message_ids:
+            return processed
+        
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            # One query per chunk instead of one per email
+            for start in range(0, len(message_ids), _MAX_QUERY_PARAMS):
+                chunk = message_ids[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT message_id FROM processed_emails WHERE message_id IN ({placeholders})",
+                    chunk
+                )
+                processed.update(row[0] for row in cursor.fetchall())
+        
+        return processed
+    
     def mark_processed(self, message_id: str) -> None:
         """Mark an email as processed.
         
         Args:
             message_id: Message ID to mark as processed
         """
-        with sqlite3.connect(self.db_file_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -88,6 +198,63 @@ class SQLiteStateManager:
             
             conn.commit()
     
+    def mark_emails_as_processed(self, message_ids: Iterable[str]) -> None:
+        """Mark several emails as processed in a single transaction.
+        
+        Args:
+            message_ids: Message IDs to mark as processed
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT OR REPLACE INTO processed_emails (message_id)
+                VALUES (?)
+            """, ((message_id,) for message_id in message_ids))
+            
+            conn.commit()
+    
+    def get_last_scan(self, account: str, folder: str) -> Optional[Tuple[int, int]]:
+        """Get where the last complete scan of a folder ended.
+        
+        Args:
+            account: Name of the account
+            folder: Name of the folder
+            
+        Returns:
+            The folder's (UIDVALIDITY, UIDNEXT) at its last complete scan, or None
+            if the folder was never scanned completely
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                "SELECT uid_validity, uid_next FROM folder_scans WHERE account = ? AND folder = ?",
+                (account, folder)
+            )
+            row = cursor.fetchone()
+        
+        return (row[0], row[1]) if row else None
+    
+    def set_last_scan(self, account: str, folder: str, uid_validity: int, uid_next: int) -> None:
+        """Record a complete scan of a folder.
+        
+        Args:
+            account: Name of the account
+            folder: Name of the folder
+            uid_validity: UIDVALIDITY of the folder when it was scanned
+            uid_next: UIDNEXT of the folder when it was scanned
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO folder_scans (account, folder, uid_validity, uid_next)
+                VALUES (?, ?, ?, ?)
+            """, (account, folder, uid_validity, uid_next))
+            
+            conn.commit()
+    
     def cleanup_old_entries(self, max_age_days: int = 30) -> None:
         """Clean up old entries from the database.
         
@@ -96,7 +263,7 @@ class SQLiteStateManager:
         """
         cutoff_date = datetime.now() - timedelta(days=max_age_days)
         
-        with sqlite3.connect(self.db_file_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute(
@@ -108,7 +275,8 @@ class SQLiteStateManager:
     
     def clear(self) -> None:
         """Clear all entries from the database."""
-        with sqlite3.connect(self.db_file_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM processed_emails")
+            cursor.execute("DELETE FROM folder_scans")
             conn.commit()
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import json
 
 import torch
@@ -24,7 +24,8 @@ class EmailCategorizationModel:
         device: str = 'mps',
         lora_r: int = 8,
         lora_alpha: int = 16,
-        lora_dropout: float = 0.1
+        lora_dropout: float = 0.1,
+        labels: Optional[List[str]] = None
     ):
         """Initialize the model.
         
@@ -35,10 +36,12 @@ class EmailCategorizationModel:
             lora_r: LoRA attention dimension
             lora_alpha: LoRA alpha parameter
             lora_dropout: LoRA dropout rate
+            labels: Category name of each label id (defaults to the ids themselves)
         """
         self.device = device
         self.model_name = model_name
         self.num_labels = num_labels
+        self.labels = list(labels) if labels else [str(i) for i in range(num_labels)]
         
         # Load and configure tokenizer
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -110,10 +113,11 @@ class EmailCategorizationModel:
         # Save tokenizer
         self.tokenizer.save_pretrained(output_dir)
         
-        # Save config with num_labels
+        # Save config with num_labels and the category name of each label
         config = {
             "num_labels": self.num_labels,
-            "model_name": self.model_name
+            "model_name": self.model_name,
+            "labels": self.labels
         }
         with open(output_dir / "config.json", "w") as f:
             json.dump(config, f, indent=2)
@@ -169,11 +173,14 @@ class EmailCategorizationModel:
         """
         model_dir = Path(model_dir)
         
-        # Load model config to get num_labels
+        # Load model config to get num_labels and the label names
         config_path = model_dir / "config.json"
         with open(config_path, "r") as f:
             config = json.loads(f.read())
             num_labels = config["num_labels"]
+            labels = config.get("labels")
+        if not labels:
+            logger.warning(f"{config_path} has no label names, predictions will use label ids")
         
         # Load base model with correct num_labels
         model = AutoModelForSequenceClassification.from_pretrained(
@@ -187,7 +194,8 @@ class EmailCategorizationModel:
         instance = cls(
             model_name="microsoft/phi-2",  # Use base model name
             num_labels=num_labels,
-            device=device
+            device=device,
+            labels=labels
         )
         
         # Load saved weights
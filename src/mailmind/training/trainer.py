@@ -63,7 +63,8 @@ class ModelTrainer:
             self.model = EmailCategorizationModel(
                 model_name=self.model_name,
                 num_labels=len(dataset.category_to_id),
-                device=self.device
+                device=self.device,
+                labels=[dataset.id_to_category[i] for i in range(len(dataset.id_to_category))]
             )
         
         # Set up data loader
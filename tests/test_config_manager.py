@@ -0,0 +1,73 @@
+"""Tests for the config manager module."""
+
+import os
+
+import pytest
+
+from mailmind.config_manager import ConfigManager
+
+
+CONFIG = """
+accounts:
+  - name: "Test Account"
+    email: "test@example.com"
+    password: "password"
+    imap_server: "imap.example.com"
+    categories:
+      - name: "SPAM"
+        description: "Unwanted emails"
+        foldername: "[Spam]"
+options:
+  confidence_threshold: {threshold}
+"""
+
+
+def write_config(path, content, mtime_ns):
+    """Write the config file with an explicit modification time."""
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Create a config file with a confidence threshold of 60."""
+    path = tmp_path / "config.yaml"
+    write_config(path, CONFIG.format(threshold=60.0), 1_000_000_000)
+    return path
+
+
+def test_reload_unchanged_file(config_path):
+    """An unchanged file is not loaded again."""
+    config_manager = ConfigManager(str(config_path))
+    
+    assert not config_manager.reload_if_changed()
+    assert config_manager.options.confidence_threshold == 60.0
+
+
+def test_reload_picks_up_change(config_path):
+    """A changed file replaces the options and accounts."""
+    config_manager = ConfigManager(str(config_path))
+    write_config(config_path, CONFIG.format(threshold=75.0), 2_000_000_000)
+    
+    assert config_manager.reload_if_changed()
+    assert config_manager.options.confidence_threshold == 75.0
+    assert [account.name for account in config_manager.accounts] == ["Test Account"]
+
+
+def test_reload_keeps_previous_config_on_broken_yaml(config_path):
+    """A file that fails to parse leaves the previous configuration in effect."""
+    config_manager = ConfigManager(str(config_path))
+    accounts = config_manager.accounts
+    options = config_manager.options
+    write_config(config_path, "accounts: [\n", 2_000_000_000)
+    
+    assert not config_manager.reload_if_changed()
+    assert config_manager.accounts is accounts
+    assert config_manager.options is options
+    
+    # The broken file is not parsed again until it changes
+    assert not config_manager.reload_if_changed()
+    
+    write_config(config_path, CONFIG.format(threshold=80.0), 3_000_000_000)
+    assert config_manager.reload_if_changed()
+    assert config_manager.options.confidence_threshold == 80.0
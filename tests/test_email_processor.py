@@ -0,0 +1,142 @@
+"""Tests for the email processor module."""
+
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("imapclient")
+pytest.importorskip("torch")
+
+from mailmind.email_processor import EmailProcessor
+from mailmind.inference.models import Account, Email
+
+
+CONFIG = """
+accounts:
+  - name: "Test Account"
+    email: "test@example.com"
+    password: "password"
+    imap_server: "imap.example.com"
+    categories:
+      - name: "SPAM"
+        description: "Unwanted emails"
+        foldername: "[Spam]"
+      - name: "INBOX"
+        description: "Important emails"
+        foldername: "INBOX"
+"""
+
+
+def make_email(message_id):
+    """Create a minimal Email with the given Message-ID."""
+    return Email("Subject", "from@example.com", "to@example.com", "", "Body", b"", message_id=message_id)
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    """Create an EmailProcessor with its state in a temporary directory and no model."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG)
+    monkeypatch.setenv("MAILMIND_STATE_DIR", str(tmp_path / "state"))
+    with mock.patch("mailmind.email_processor.initialize_categorizer"):
+        yield EmailProcessor(str(config_path))
+
+
+def test_flush_state_waits_for_commit(processor):
+    """flush_state() only returns once queued records are visible in the database."""
+    committed = threading.Event()
+    release = threading.Event()
+    write = processor.state_manager.mark_emails_as_processed
+    
+    def slow_write(message_ids):
+        release.wait(5)
+        write(message_ids)
+        committed.set()
+    
+    with mock.patch.object(processor.state_manager, "mark_emails_as_processed", side_effect=slow_write):
+        processor._mark_processed([make_email("<1@example.com>"), make_email("<2@example.com>")])
+        
+        flusher = threading.Thread(target=processor.flush_state)
+        flusher.start()
+        flusher.join(0.2)
+        assert flusher.is_alive()
+        
+        release.set()
+        flusher.join(5)
+        assert not flusher.is_alive()
+        assert committed.is_set()
+    
+    assert processor.state_manager.get_processed_ids(["<1@example.com>", "<2@example.com>"]) == {
+        "<1@example.com>",
+        "<2@example.com>",
+    }
+
+
+def test_failed_write_is_forgotten(processor):
+    """Records the writer could not commit are dropped from the cache, so they are processed again."""
+    with mock.patch.object(
+        processor.state_manager, "mark_emails_as_processed", side_effect=Exception("database is locked")
+    ):
+        processor._mark_processed([make_email("<1@example.com>")])
+        processor.flush_state()
+    
+    assert "<1@example.com>" not in processor._processed_ids
+    assert processor._filter_unprocessed({10: "<1@example.com>"}) == [10]
+    
+    # The writer keeps running after a failure
+    processor._mark_processed([make_email("<2@example.com>")])
+    processor.flush_state()
+    assert processor.state_manager.get_processed_ids(["<2@example.com>"]) == {"<2@example.com>"}
+
+
+def test_reload_pushes_confidence_threshold(processor):
+    """A reloaded confidence_threshold reaches the categorizer."""
+    config_path = processor.config_manager.config_path
+    with open(config_path, "a") as f:
+        f.write("options:\n  confidence_threshold: 80.0\n")
+    mtime_ns = os.stat(config_path).st_mtime_ns + 1_000_000_000
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+    
+    with mock.patch("mailmind.email_processor.set_escalation_threshold") as set_threshold:
+        assert processor._reload_config()
+    set_threshold.assert_called_once_with(80.0)
+    
+    with mock.patch("mailmind.email_processor.set_escalation_threshold") as set_threshold:
+        assert not processor._reload_config()
+    set_threshold.assert_not_called()
+
+
+def test_process_all_accounts_reports_failed_accounts(processor):
+    """One failing account does not stop the others, and is named in the error."""
+    processor.config_manager.accounts = [
+        Account("Work", "work@example.com", "password", "imap.example.com"),
+        Account("Home", "home@example.com", "password", "imap.example.com"),
+    ]
+    
+    def process_account(account):
+        if account.name == "Work":
+            raise ConnectionError("connection reset")
+        return {"SPAM": {"moved": 1}}
+    
+    with mock.patch.object(processor, "process_account", side_effect=process_account) as processed:
+        with pytest.raises(RuntimeError, match="1 of 2 accounts: Work"):
+            processor.process_all_accounts()
+    
+    assert sorted(call[0][0].name for call in processed.call_args_list) == ["Home", "Work"]
+
+
+def test_monitor_skips_idle_when_select_fails(processor):
+    """IDLE is not entered on whatever folder was selected before a failed SELECT."""
+    client = mock.MagicMock()
+    client.use_uid = True
+    client.select_folder.side_effect = Exception("NO [NONEXISTENT]")
+    stop_event = processor._stop_event
+    
+    with mock.patch.object(processor.imap_manager, "connect", return_value=client), \
+            mock.patch.object(stop_event, "wait", side_effect=lambda timeout: stop_event.set()):
+        processor._monitor_account(processor.config_manager.accounts[0])
+    
+    client.select_folder.assert_called_once_with("INBOX")
+    client.idle.assert_not_called()
@@ -0,0 +1,313 @@
+"""Tests for the IMAP manager module."""
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("imapclient")
+
+from mailmind.imap_manager import IMAPManager, _any_of
+
+
+SEEN = b'\\Seen'
+
+
+def make_envelope(message_id=None, subject=None, date=None):
+    """Create an ENVELOPE stand-in with the fields the manager reads."""
+    return SimpleNamespace(message_id=message_id, subject=subject, date=date)
+
+
+@pytest.fixture
+def mock_client():
+    """Create a mock IMAPClient that uses UIDs and knows the target folders."""
+    client = mock.MagicMock()
+    client.use_uid = True
+    client._imap.untagged_responses = {}
+    client.list_folders.return_value = [((), b'/', "INBOX"), ((), b'/', "Spam"), ((), b'/', "Receipts")]
+    client.search.return_value = []
+    return client
+
+
+def test_any_of_single_key():
+    """A single key is used as it is."""
+    key = ['HEADER', 'Message-ID', b'<1@example.com>']
+    assert _any_of([key]) == key
+
+
+def test_any_of_two_keys():
+    """Two keys are combined with one OR."""
+    assert _any_of([['SUBJECT', 'a'], ['SUBJECT', 'b']]) == ['OR', ['SUBJECT', 'a'], ['SUBJECT', 'b']]
+
+
+def test_any_of_odd_number_of_keys():
+    """An odd number of keys nests into a balanced tree."""
+    keys = [['SUBJECT', str(i)] for i in range(5)]
+    assert _any_of(keys) == [
+        'OR',
+        ['OR', keys[0], keys[1]],
+        ['OR', keys[2], ['OR', keys[3], keys[4]]],
+    ]
+
+
+def test_pop_copyuid(mock_client):
+    """COPYUID ranges are expanded and the response is consumed."""
+    mock_client._imap.untagged_responses['COPYUID'] = [b'7 3:4,9 100:102']
+    
+    assert IMAPManager._pop_copyuid(mock_client) == {3: 100, 4: 101, 9: 102}
+    assert 'COPYUID' not in mock_client._imap.untagged_responses
+
+
+def test_pop_copyuid_without_uids(mock_client):
+    """Sequence numbers cannot be mapped, so COPYUID is ignored without UIDs."""
+    mock_client.use_uid = False
+    mock_client._imap.untagged_responses['COPYUID'] = [b'7 3 100']
+    
+    assert IMAPManager._pop_copyuid(mock_client) == {}
+
+
+def test_move_restores_unread_from_copyuid(mock_client):
+    """Only unread emails get their Seen flag removed, using the COPYUID UIDs."""
+    mock_client.fetch.return_value = {
+        3: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<3@example.com>')},
+        4: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<4@example.com>')},
+    }
+    
+    def move(msg_ids, folder):
+        mock_client._imap.untagged_responses['COPYUID'] = [b'7 3:4 100:101']
+    mock_client.move.side_effect = move
+    
+    moved = IMAPManager().move_emails_bulk(mock_client, {"Spam": [3, 4]}, "INBOX")
+    
+    assert moved == {"Spam": True}
+    mock_client.move.assert_called_once_with([3, 4], "Spam")
+    mock_client.search.assert_not_called()
+    mock_client.remove_flags.assert_called_once_with([100], [SEEN], silent=True)
+
+
+def test_move_restores_unread_by_search_without_copyuid(mock_client):
+    """Without COPYUID, unread emails are found again with one ORed search."""
+    mock_client.fetch.return_value = {
+        3: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<3@example.com>')},
+        4: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<4@example.com>')},
+        5: {b'FLAGS': (), b'ENVELOPE': make_envelope(None, b'Your receipt', b'date')},
+    }
+    mock_client.search.return_value = [200, 201]
+    
+    moved = IMAPManager().move_emails_bulk(mock_client, {"Receipts": [3, 4, 5]}, "INBOX")
+    
+    assert moved == {"Receipts": True}
+    mock_client.search.assert_called_once_with(
+        ['OR', ['HEADER', 'Message-ID', b'<3@example.com>'], ['SUBJECT', b'Your receipt']], charset=None
+    )
+    mock_client.remove_flags.assert_called_once()
+    assert sorted(mock_client.remove_flags.call_args[0][0]) == [200, 201]
+
+
+
+def test_move_searches_non_ascii_subject_as_utf8(mock_client):
+    """Non-ASCII subjects are sent as UTF-8 bytes with the charset named, as nested keys can't carry it."""
+    mock_client.fetch.return_value = {
+        5: {b'FLAGS': (), b'ENVELOPE': make_envelope(None, 'Kvittering for ordre på nett'.encode('utf-8'), b'date')},
+    }
+    mock_client.search.return_value = [200]
+    
+    IMAPManager().move_emails_bulk(mock_client, {"Receipts": [5]}, "INBOX")
+    
+    mock_client.search.assert_called_once_with(
+        ['SUBJECT', 'Kvittering for ordre på nett'.encode('utf-8')], charset='UTF-8'
+    )
+    mock_client.remove_flags.assert_called_once_with([200], [SEEN], silent=True)
+
+
+def test_move_restores_copyuid_emails_when_search_fails(mock_client):
+    """A failing search loses only the emails it looked for, not those named by COPYUID."""
+    mock_client.fetch.return_value = {
+        3: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<3@example.com>')},
+        4: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<4@example.com>')},
+    }
+    
+    def move(msg_ids, folder):
+        mock_client._imap.untagged_responses['COPYUID'] = [b'7 3 100']
+    mock_client.move.side_effect = move
+    mock_client.search.side_effect = Exception("BAD [BADCHARSET]")
+    
+    moved = IMAPManager().move_emails_bulk(mock_client, {"Receipts": [3, 4]}, "INBOX")
+    
+    assert moved == {"Receipts": True}
+    mock_client.remove_flags.assert_called_once_with([100], [SEEN], silent=True)
+    assert mock_client.select_folder.call_args_list[-1] == mock.call("INBOX")
+
+def test_move_reselects_source_folder_last(mock_client):
+    """The source folder is selected again once the unread flags are restored."""
+    mock_client.fetch.return_value = {
+        3: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<3@example.com>')},
+        4: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<4@example.com>')},
+    }
+    
+    moved = IMAPManager().move_emails_bulk(mock_client, {"Spam": [3], "Receipts": [4]}, "INBOX")
+    
+    assert moved == {"Spam": True, "Receipts": True}
+    selected = [call[0][0] for call in mock_client.select_folder.call_args_list]
+    assert sorted(selected[:-1]) == ["Receipts", "Spam"]
+    assert selected[-1] == "INBOX"
+
+
+def test_move_skips_reselect_when_all_read(mock_client):
+    """Nothing is restored for read emails, so the source folder stays selected."""
+    mock_client.fetch.return_value = {3: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<3@example.com>')}}
+    
+    assert IMAPManager().move_emails_bulk(mock_client, {"Spam": [3]}, "INBOX") == {"Spam": True}
+    mock_client.select_folder.assert_not_called()
+    mock_client.remove_flags.assert_not_called()
+
+
+def test_move_failure_is_reported_per_folder(mock_client):
+    """A failed MOVE only fails its own folder."""
+    mock_client.fetch.return_value = {
+        3: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<3@example.com>')},
+        4: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<4@example.com>')},
+    }
+    
+    def move(msg_ids, folder):
+        if folder == "Spam":
+            raise Exception("NO [OVERQUOTA]")
+    mock_client.move.side_effect = move
+    
+    moved = IMAPManager().move_emails_bulk(mock_client, {"Spam": [3], "Receipts": [4]}, "INBOX")
+    
+    assert moved == {"Spam": False, "Receipts": True}
+
+
+
+def test_failed_move_forgets_target_folder(mock_client):
+    """A folder deleted since it was listed is created again by the next move."""
+    mock_client.fetch.return_value = {3: {b'FLAGS': (SEEN,), b'ENVELOPE': make_envelope(b'<3@example.com>')}}
+    mock_client.move.side_effect = [Exception("NO [TRYCREATE] Mailbox doesn't exist"), None]
+    mock_client.folder_exists.return_value = False
+    manager = IMAPManager()
+    
+    assert manager.move_emails_bulk(mock_client, {"Spam": [3]}, "INBOX") == {"Spam": False}
+    mock_client.create_folder.assert_not_called()
+    
+    assert manager.move_emails_bulk(mock_client, {"Spam": [3]}, "INBOX") == {"Spam": True}
+    mock_client.create_folder.assert_called_once_with("Spam")
+    mock_client.folder_exists.assert_called_once_with("Spam")
+    mock_client.list_folders.assert_called_once()
+
+def test_failed_select_forgets_previous_folder(mock_client):
+    """A failed SELECT leaves no folder selected and no UIDNEXT from the folder before."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 40}
+    mock_client.search.return_value = [38, 39]
+    manager.get_email_headers(mock_client, "INBOX", 10)
+    assert manager.get_selected_folder(mock_client) == "INBOX"
+    assert manager.get_uid_next(mock_client) == 40
+    assert manager.get_complete_scan(mock_client) == (5, 40)
+    
+    mock_client.select_folder.side_effect = Exception("NO [NONEXISTENT]")
+    assert manager.get_email_headers(mock_client, "Archive", 10) == {}
+    
+    assert manager.get_selected_folder(mock_client) is None
+    assert manager.get_uid_next(mock_client) is None
+    assert manager.get_complete_scan(mock_client) is None
+
+
+def test_failed_reselect_after_move_is_tracked(mock_client):
+    """If the source folder can't be selected again, no folder counts as selected."""
+    mock_client.fetch.return_value = {3: {b'FLAGS': (), b'ENVELOPE': make_envelope(b'<3@example.com>')}}
+    
+    def select_folder(folder):
+        if folder == "INBOX":
+            raise Exception("connection reset")
+        return {}
+    mock_client.select_folder.side_effect = select_folder
+    
+    manager = IMAPManager()
+    assert manager.move_emails_bulk(mock_client, {"Spam": [3]}, "INBOX") == {"Spam": True}
+    assert manager.get_selected_folder(mock_client) is None
+
+
+def test_scan_without_last_scan_searches_everything(mock_client):
+    """Without a previous scan the whole folder is searched, and the scan can be resumed at UIDNEXT."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 40}
+    mock_client.search.return_value = [12, 39, 20]
+    
+    assert manager._select_recent(mock_client, "INBOX", 10) == [39, 20, 12]
+    mock_client.search.assert_called_once_with(['ALL'])
+    assert manager.get_complete_scan(mock_client) == (5, 40)
+
+
+def test_scan_is_narrowed_to_new_uids(mock_client):
+    """With a matching UIDVALIDITY only UIDs from the last scan's UIDNEXT up are searched."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 45}
+    mock_client.search.return_value = [41, 44]
+    
+    assert manager._select_recent(mock_client, "INBOX", 10, (5, 40)) == [44, 41]
+    mock_client.search.assert_called_once_with(['UID', '40:*'])
+    assert manager.get_complete_scan(mock_client) == (5, 45)
+
+
+def test_narrowed_scan_drops_highest_uid_below_range(mock_client):
+    """The highest UID below n also matches "n:*", but is not new."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 40}
+    mock_client.search.return_value = [39]
+    
+    assert manager._select_recent(mock_client, "INBOX", 10, (5, 40)) == []
+
+
+def test_new_uidvalidity_searches_everything(mock_client):
+    """A renumbered folder can't be narrowed with UIDs from before."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 6, b'UIDNEXT': 3}
+    mock_client.search.return_value = [1, 2]
+    
+    assert manager._select_recent(mock_client, "INBOX", 10, (5, 40)) == [2, 1]
+    mock_client.search.assert_called_once_with(['ALL'])
+    assert manager.get_complete_scan(mock_client) == (6, 3)
+
+
+def test_capped_scan_resumes_above_newest_returned(mock_client):
+    """A scan cut off at max_emails can still narrow the next one, above the newest email it returned."""
+    manager = IMAPManager()
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 60}
+    mock_client.search.return_value = list(range(1, 51))
+    
+    assert manager._select_recent(mock_client, "INBOX", 3) == [50, 49, 48]
+    assert manager.get_complete_scan(mock_client) == (5, 51)
+
+
+def test_scan_without_uids_is_not_resumable(mock_client):
+    """Sequence numbers shift as emails are expunged, so only UID scans can be resumed."""
+    manager = IMAPManager()
+    mock_client.use_uid = False
+    mock_client.select_folder.return_value = {b'UIDVALIDITY': 5, b'UIDNEXT': 40}
+    mock_client.search.return_value = [1, 2]
+    
+    manager._select_recent(mock_client, "INBOX", 10, (5, 30))
+    mock_client.search.assert_called_once_with(['ALL'])
+    assert manager.get_complete_scan(mock_client) is None
+
+
+def test_get_new_email_headers(mock_client):
+    """Only UIDs from uid_next up are fetched, newest first when capped."""
+    manager = IMAPManager()
+    mock_client.search.return_value = [39, 40, 41, 42]
+    
+    with mock.patch.object(manager, "_fetch_message_ids", return_value={42: "<42@example.com>"}) as fetch:
+        assert manager.get_new_email_headers(mock_client, "INBOX", 40, max_emails=2) == {42: "<42@example.com>"}
+    
+    mock_client.search.assert_called_once_with(['UID', '40:*'])
+    fetch.assert_called_once_with(mock_client, [42, 41])
+
+
+def test_get_new_email_headers_without_new_emails(mock_client):
+    """Nothing is fetched when only the highest existing UID matches "n:*"."""
+    manager = IMAPManager()
+    mock_client.search.return_value = [39]
+    
+    assert manager.get_new_email_headers(mock_client, "INBOX", 40) == {}
+    mock_client.fetch.assert_not_called()
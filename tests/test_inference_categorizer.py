@@ -0,0 +1,167 @@
+"""Tests for the model-based categorizer."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from mailmind.inference import categorizer
+from mailmind.inference.categorizer import CategorizerService, EmailCategorizer
+
+
+class StubEncoding(dict):
+    """Tokenizer output that keeps the texts, so the stub model can read them."""
+    
+    def to(self, device):
+        return self
+
+
+class StubTokenizer:
+    """Records every batch it tokenizes."""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        self.batches.append((list(texts), max_length))
+        return StubEncoding(texts=list(texts), max_length=max_length)
+
+
+class StubModel:
+    """Predicts SPAM for texts mentioning spam, and is unsure of "maybe" texts on short passes."""
+    
+    labels = ["SPAM", "INBOX"]
+    
+    def __init__(self, full_length):
+        self.full_length = full_length
+        self.tokenizer = StubTokenizer()
+    
+    def forward(self, texts, max_length):
+        rows = []
+        for text in texts:
+            margin = 0.1 if "maybe" in text.lower() and max_length < self.full_length else 10.0
+            rows.append([margin, 0.0] if "spam" in text.lower() else [0.0, margin])
+        return {"logits": torch.tensor(rows)}
+
+
+def make_email(subject, body="Hello"):
+    """Create an email dictionary as the processor passes it to the categorizer."""
+    return {"from": "sender@example.com", "to": "me@example.com", "subject": subject, "date": "", "body": body}
+
+
+def make_categorizer(tmp_path, **kwargs):
+    """Create a categorizer around the stub model."""
+    (tmp_path / "config.json").write_text("{}")
+    model = StubModel(kwargs.get("max_length", 512))
+    with mock.patch.object(categorizer, "MODEL_PATH", tmp_path), \
+            mock.patch.object(categorizer, "_load_model", return_value=model):
+        return EmailCategorizer(**kwargs)
+
+
+def tokenized_texts(email_categorizer):
+    """Every text the stub tokenizer has seen, over all batches."""
+    return [text for texts, _ in email_categorizer.tokenizer.batches for text in texts]
+
+
+def test_duplicates_map_back_to_every_email(tmp_path):
+    """Identical emails run through the model once and every copy gets the result."""
+    email_categorizer = make_categorizer(tmp_path)
+    emails = [make_email("Cheap spam"), make_email("Lunch?"), make_email("Cheap spam"), make_email("Cheap spam")]
+    
+    results = email_categorizer.categorize_emails(emails)
+    
+    assert [result["category"] for result in results] == ["SPAM", "INBOX", "SPAM", "SPAM"]
+    assert len(tokenized_texts(email_categorizer)) == 2
+    
+    # Each caller gets its own copy of the shared result
+    results[0]["category"] = "CHANGED"
+    assert results[2]["category"] == "SPAM"
+
+
+def test_cache_hits_skip_the_model(tmp_path):
+    """Emails seen in an earlier call are answered from the cache."""
+    email_categorizer = make_categorizer(tmp_path)
+    first = email_categorizer.categorize_emails([make_email("Cheap spam"), make_email("Lunch?")])
+    email_categorizer.tokenizer.batches.clear()
+    
+    second = email_categorizer.categorize_emails([make_email("Lunch?"), make_email("Cheap spam")])
+    
+    assert email_categorizer.tokenizer.batches == []
+    assert second == [first[1], first[0]]
+
+
+def test_batches_respect_the_token_budget(tmp_path):
+    """Short emails share larger batches, but no batch pads past batch_size * max_length tokens."""
+    email_categorizer = make_categorizer(tmp_path, max_length=128, primary_max_length=128)
+    emails = [make_email(f"Short {i}", "Hi") for i in range(30)]
+    emails += [make_email(f"Long {i}", "word " * 1000) for i in range(10)]
+    batch_size = 4
+    
+    results = email_categorizer.categorize_emails(emails, batch_size)
+    
+    assert len(results) == len(emails)
+    assert all(result is not None for result in results)
+    budget = batch_size * 128
+    for texts, _ in email_categorizer.tokenizer.batches:
+        longest = max(len(text) for text in texts)
+        padded_tokens = min(128, longest // categorizer._CHARS_PER_TOKEN_ESTIMATE + 1)
+        assert len(texts) == 1 or len(texts) * padded_tokens <= budget
+    assert max(len(texts) for texts, _ in email_categorizer.tokenizer.batches) > batch_size
+
+
+def test_low_confidence_is_rerun_at_max_length(tmp_path):
+    """Emails below the escalation threshold are classified again with the full length."""
+    email_categorizer = make_categorizer(
+        tmp_path, max_length=512, primary_max_length=128, escalation_threshold=60.0
+    )
+    
+    results = email_categorizer.categorize_emails([make_email("Maybe spam"), make_email("Lunch?")])
+    
+    passes = [(len(texts), max_length) for texts, max_length in email_categorizer.tokenizer.batches]
+    assert passes == [(2, 128), (1, 512)]
+    assert "Maybe spam" in email_categorizer.tokenizer.batches[1][0][0]
+    assert results[0]["category"] == "SPAM"
+    assert results[0]["confidence"] > 60.0
+
+
+def test_threshold_change_clears_cache(tmp_path):
+    """Results escalated against an old threshold are not reused after it changes."""
+    email_categorizer = make_categorizer(tmp_path)
+    email_categorizer.categorize_emails([make_email("Lunch?")])
+    
+    email_categorizer.set_escalation_threshold(90.0)
+    email_categorizer.tokenizer.batches.clear()
+    email_categorizer.categorize_emails([make_email("Lunch?")])
+    
+    assert len(email_categorizer.tokenizer.batches) == 1
+
+
+def test_service_rejects_requests_after_close(tmp_path):
+    """submit() fails fast once the service is closed, instead of returning a future that never resolves."""
+    service = CategorizerService(make_categorizer(tmp_path), max_wait_ms=0)
+    assert service.submit([make_email("Lunch?")]).result(timeout=5)[0]["category"] == "INBOX"
+    
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.submit([make_email("Lunch?")])
+    service._worker.join(5)
+    assert not service._worker.is_alive()
+
+
+def test_service_fails_queued_requests_when_worker_stops(tmp_path):
+    """Requests still queued when the worker exits get an exception rather than hanging."""
+    release = threading.Event()
+    
+    with mock.patch.object(CategorizerService, "_serve", side_effect=lambda: release.wait(5)):
+        service = CategorizerService(make_categorizer(tmp_path))
+        future = service.submit([make_email("Lunch?")])
+        release.set()
+        
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    
+    service._worker.join(5)
+    with pytest.raises(RuntimeError):
+        service.submit([make_email("Lunch?")])
@@ -0,0 +1,70 @@
+"""Tests for the data models."""
+
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from mailmind.inference.models import Account, Category
+
+
+def make_account(categories=None):
+    """Create an account with the given categories."""
+    return Account("Test Account", "test@example.com", "password", "imap.example.com", categories=categories)
+
+
+def test_category_lookup_ignores_case():
+    """Categories are found by name regardless of case."""
+    account = make_account()
+    
+    assert account.get_category_by_name("spam").foldername == "Spam"
+    assert account.get_folder_for_category("Receipts") == "[Receipts]"
+    assert account.get_category_by_name("unknown") is None
+    assert account.get_folder_for_category("unknown") == "INBOX"
+
+
+def test_first_category_definition_wins():
+    """A name defined twice resolves to its first definition."""
+    account = make_account([Category("News", "", "News"), Category("NEWS", "", "Newsletters")])
+    
+    assert account.get_folder_for_category("news") == "News"
+
+
+def test_category_index_is_rebuilt_after_edit():
+    """Edits to the categories show up once the index is invalidated."""
+    account = make_account([Category("SPAM", "", "Spam")])
+    account.categories.append(Category("Receipts", "", "[Receipts]"))
+    
+    account._invalidate_category_index()
+    
+    assert account.get_folder_for_category("RECEIPTS") == "[Receipts]"
+
+
+def test_category_name_upper_is_not_compared_or_shown():
+    """name_upper is a field, but left out of __init__, equality, hash and repr."""
+    category = Category("Spam", "Unwanted emails", "Spam")
+    
+    assert category.name_upper == "SPAM"
+    assert "name_upper" not in repr(category)
+    assert category == Category("Spam", "Unwanted emails", "Spam")
+    assert hash(category) == hash(Category("Spam", "Unwanted emails", "Spam"))
+    assert [f.name for f in dataclasses.fields(Category) if f.init] == ["name", "description", "foldername"]
+
+
+def test_category_is_slotted_and_frozen():
+    """Categories have no instance dictionary and can't be changed."""
+    category = Category("Spam", "Unwanted emails", "Spam")
+    
+    assert not hasattr(category, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        category.name = "Ham"
+
+
+def test_category_survives_copy_and_pickle():
+    """Copies are rebuilt through __init__, so name_upper is set again."""
+    category = Category("Spam", "Unwanted emails", "Spam")
+    
+    for restored in (copy.copy(category), copy.deepcopy(category), pickle.loads(pickle.dumps(category))):
+        assert restored == category
+        assert restored.name_upper == "SPAM"
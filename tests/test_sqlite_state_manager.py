@@ -0,0 +1,107 @@
+"""Tests for the SQLite state manager module."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from mailmind import sqlite_state_manager
+from mailmind.sqlite_state_manager import SQLiteStateManager
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """Create a state manager backed by a fresh database."""
+    manager = SQLiteStateManager(str(tmp_path / "state.db"))
+    yield manager
+    manager.close()
+
+
+def test_get_processed_ids_across_chunks(state_manager):
+    """Lookups larger than one query's parameter limit are split and merged."""
+    processed = [f"<{i}@example.com>" for i in range(0, 2000, 2)]
+    state_manager.mark_emails_as_processed(processed)
+    
+    lookup = [f"<{i}@example.com>" for i in range(2000)]
+    assert len(lookup) > sqlite_state_manager._MAX_QUERY_PARAMS
+    assert state_manager.get_processed_ids(lookup) == set(processed)
+
+
+def test_get_processed_ids_small_chunks(state_manager, monkeypatch):
+    """Every chunk contributes to the result, including a short last one."""
+    monkeypatch.setattr(sqlite_state_manager, "_MAX_QUERY_PARAMS", 3)
+    state_manager.mark_emails_as_processed(["<a>", "<c>", "<g>"])
+    
+    assert state_manager.get_processed_ids(["<a>", "<b>", "<c>", "<d>", "<e>", "<f>", "<g>"]) == {"<a>", "<c>", "<g>"}
+
+
+def test_duplicate_ids(state_manager, monkeypatch):
+    """Duplicates are recorded once and may span chunks in a lookup."""
+    monkeypatch.setattr(sqlite_state_manager, "_MAX_QUERY_PARAMS", 2)
+    state_manager.mark_emails_as_processed(["<a>", "<a>", "<b>"])
+    state_manager.mark_processed("<a>")
+    
+    assert state_manager.get_processed_ids(["<a>", "<a>", "<b>", "<a>", "<c>"]) == {"<a>", "<b>"}
+    assert state_manager.is_processed("<a>")
+    assert not state_manager.is_processed("<c>")
+
+
+def test_get_processed_ids_empty(state_manager):
+    """An empty lookup returns an empty set."""
+    assert state_manager.get_processed_ids([]) == set()
+
+
+def test_folder_scan_round_trip(state_manager):
+    """The last scan is stored per account and folder, and replaced by newer scans."""
+    assert state_manager.get_last_scan("work", "INBOX") is None
+    
+    state_manager.set_last_scan("work", "INBOX", 7, 120)
+    state_manager.set_last_scan("home", "INBOX", 3, 40)
+    assert state_manager.get_last_scan("work", "INBOX") == (7, 120)
+    assert state_manager.get_last_scan("home", "INBOX") == (3, 40)
+    assert state_manager.get_last_scan("work", "Archive") is None
+    
+    state_manager.set_last_scan("work", "INBOX", 7, 135)
+    assert state_manager.get_last_scan("work", "INBOX") == (7, 135)
+
+
+def test_state_survives_reopen(tmp_path):
+    """A new manager on the same file sees earlier writes."""
+    db_path = str(tmp_path / "state.db")
+    first = SQLiteStateManager(db_path)
+    first.mark_emails_as_processed(["<a>"])
+    first.set_last_scan("work", "INBOX", 7, 120)
+    first.close()
+    
+    second = SQLiteStateManager(db_path)
+    assert second.get_processed_ids(["<a>"]) == {"<a>"}
+    assert second.get_last_scan("work", "INBOX") == (7, 120)
+    second.close()
+
+
+def test_clear_empties_both_tables(state_manager):
+    """clear() forgets processed emails and folder scans."""
+    state_manager.mark_emails_as_processed(["<a>", "<b>"])
+    state_manager.set_last_scan("work", "INBOX", 7, 120)
+    
+    state_manager.clear()
+    
+    assert state_manager.get_processed_ids(["<a>", "<b>"]) == set()
+    assert state_manager.get_last_scan("work", "INBOX") is None
+
+
+def test_close_closes_every_thread_connection(state_manager):
+    """close() closes connections opened by other threads too, and later use reconnects."""
+    worker = threading.Thread(target=state_manager.mark_emails_as_processed, args=(["<a>"],))
+    worker.start()
+    worker.join()
+    state_manager.is_processed("<a>")
+    connections = list(state_manager._connections.values())
+    assert len(connections) == 2
+    
+    state_manager.close()
+    
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert state_manager.is_processed("<a>")